@@ -18,29 +18,38 @@ integration into other applications (Discord bots, web APIs, etc.).
 import argparse
 import asyncio
 import csv
-import io
+import functools
+import hashlib
+import importlib.util
+import itertools
 import logging
+import os
+import random
 import re
 import shutil
+import signal
 import sys
 import threading
 import time
+import weakref
 from collections import OrderedDict
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Final, Literal, TypedDict
+from typing import Any, Final, Literal, TypedDict
+from urllib.parse import urlencode
 
-import aiofiles
 import httpx
 import orjson
-import uvloop
 
 # --- PEP 695 type aliases ---
 type ScanMode = Literal["sherlock", "reddit", "both"]
 # Plain dict alias: Perspective API returns dynamic keys — TypedDict adds no value here.
 type ToxicityScores = dict[str, float]
+# (kind, subreddit, text, created_utc) for a single fetched comment or post.
+type RedditItem = tuple[str, str, str, float]
 
 # --- TypedDicts for structured data at module boundaries ---
 
@@ -79,67 +88,144 @@ class ScanResult(TypedDict):
     errors: list[str]
 
 
-# --- Thread-safe lock for Sherlock availability cache (sync API) ---
-_sherlock_available_thread_lock = threading.Lock()
-
 # --- Constants ---
 PERSPECTIVE_URL: Final = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+PERSPECTIVE_BATCH_URL: Final = "https://commentanalyzer.googleapis.com/batch"
+PERSPECTIVE_BATCH_PATH: Final = "/v1alpha1/comments:analyze"
+PERSPECTIVE_BATCH_SIZE: Final = 100
+REDDIT_PAGE_SIZE: Final = 100
+REDDIT_TOKEN_MARGIN: Final = 60  # refresh tokens this many seconds before expiry
+HTTP_UNAUTHORIZED: Final = 401
+HTTP_FORBIDDEN: Final = 403
+# Bodies Reddit substitutes for deleted/removed content; nothing left to score.
+REDDIT_PLACEHOLDERS: Final = frozenset({"[deleted]", "[removed]"})
+PERSPECTIVE_BATCH_BOUNDARY: Final = "batch_perspective"
 DEFAULT_TIMEOUT: Final = 10
+CONNECT_TIMEOUT: Final = 5
+JSON_HEADERS: Final = {"Content-Type": "application/json"}
 SHERLOCK_BUFFER: Final = 30
 SHERLOCK_PARTIAL_READ_TIMEOUT: Final = 2.0
-SHERLOCK_PARTIAL_READ_EXCEPTIONS: Final = (OSError, RuntimeError, ValueError, TimeoutError)
+SHERLOCK_TERM_GRACE: Final = 2.0  # seconds between SIGTERM and SIGKILL
+SHERLOCK_LINE_LIMIT: Final = 1 << 20  # StreamReader limit; default 64 KiB
+_SIGKILL: Final = getattr(signal, "SIGKILL", signal.SIGTERM)  # Windows has no SIGKILL
 ATTRIBUTES: Final = ("TOXICITY", "INSULT", "PROFANITY", "SEXUALLY_EXPLICIT")
-HTTP2_LIMITS: Final = httpx.Limits(max_keepalive_connections=5, max_connections=10)
+_EPOCH: Final = datetime(1970, 1, 1)
+CSV_FIELDS: Final = ("timestamp", "type", "subreddit", "content", *ATTRIBUTES)
+# Perspective request body split around the comment text, serialised once at import.
+_PAYLOAD_HEAD: Final = b'{"comment":{"text":'
+_PAYLOAD_TAIL: Final = (
+    b'},"languages":["en"],"requestedAttributes":'
+    + orjson.dumps({a: {} for a in ATTRIBUTES})
+    + b"}"
+)
+# Static multipart framing around each batch part's Content-ID index and payload.
+_BATCH_PART_HEAD: Final = (
+    f"--{PERSPECTIVE_BATCH_BOUNDARY}\r\nContent-Type: application/http\r\nContent-ID: <item-"
+).encode()
+_BATCH_PART_TAIL: Final = _PAYLOAD_TAIL + b"\r\n"
+_BATCH_CLOSE: Final = f"--{PERSPECTIVE_BATCH_BOUNDARY}--\r\n".encode()
+# Idle connections are kept past httpx's 5s default so pauses between Reddit pages
+# and Perspective batches don't cost a fresh TLS handshake.
+HTTP2_LIMITS: Final = httpx.Limits(
+    max_keepalive_connections=64, max_connections=200, keepalive_expiry=75.0
+)
+HTTP_CONNECT_RETRIES: Final = 1
+# Applied client-wide so per-call overrides can't silently drop the connect/write bounds.
+HTTP_TIMEOUT: Final = httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT, write=CONNECT_TIMEOUT)
 HTTP_OK: Final = 200
+HTTP_TOO_MANY_REQUESTS: Final = 429
+RETRYABLE_STATUS: Final = frozenset({HTTP_TOO_MANY_REQUESTS, 500, 502, 503, 504})
+MAX_RETRIES: Final = 3
+RETRY_BACKOFF_BASE: Final = 1.0
+RETRY_MAX_DELAY: Final = 30.0
 MAX_CONCURRENT_API_CALLS: Final = 5
+DEFAULT_RATE_BURST: Final = 10.0
 CACHE_TTL: Final = 900  # 15 minutes
 CACHE_MAX_SIZE: Final = 100
+SCORE_CACHE_TTL: Final = 86400  # 24 hours
+SCORE_CACHE_MAX_SIZE: Final = 10_000
 _USERNAME_SANITIZE_RE: Final = re.compile(r"[^\w\-]")
+# ASCII fast path for the same rule: every non-word ASCII character except "-" → "_".
+_USERNAME_SANITIZE_TABLE: Final = str.maketrans(
+    {c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c in "_-")}
+)
+# "[+] Platform: https://..." — optional bracketed prefixes, then platform and URL.
+_SHERLOCK_LINE_RE: Final = re.compile(
+    r"^[ \t]*(?:\[[^\]\n]*\]:?[ \t]*)*([^:\n]+):[ \t]+(https?://[^\n]*?)[ \t\r]*$",
+    re.MULTILINE,
+)
+_SHERLOCK_LINE_BYTES_RE: Final = re.compile(_SHERLOCK_LINE_RE.pattern.encode(), re.MULTILINE)
+_BOUNDARY_RE: Final = re.compile(r'boundary="?([^";]+)"?')
+_CONTENT_ID_RE: Final = re.compile(rb"Content-ID:\s*<response-item-(\d+)>", re.IGNORECASE)
 
 # --- Logging ---
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 log = logging.getLogger(__name__)
 
 # --- Module-level singletons (performance: connection & cache reuse) ---
-_http_client: httpx.AsyncClient | None = None
-_http_client_lock = asyncio.Lock()
+# One client per event loop: pooled connections are bound to the loop that opened
+# them, so a client must never outlive its loop into a later asyncio.run().
+_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
 
-_sherlock_available: bool | None = None
-_sherlock_lock = asyncio.Lock()
+_sherlock_site_data: dict[str, dict[str, Any]] | None = None
+_sherlock_site_data_lock = threading.Lock()
 
 _scan_cache: OrderedDict[str, tuple[float, ScanResult]] = OrderedDict()
 _cache_lock = asyncio.Lock()
 
+_score_cache: OrderedDict[bytes, tuple[float, ToxicityScores]] = OrderedDict()
 
-async def get_http_client() -> httpx.AsyncClient:
-    """Get or create the shared HTTP/2 client."""
-    global _http_client
-    async with _http_client_lock:
-        if _http_client is None or _http_client.is_closed:
-            _http_client = httpx.AsyncClient(
-                http2=True,
-                limits=HTTP2_LIMITS,
-                headers={"Content-Type": "application/json"},
-                timeout=DEFAULT_TIMEOUT,
-            )
-    return _http_client
+# Reddit application-only OAuth tokens by client ID: (monotonic expiry, token).
+_reddit_tokens: dict[str, tuple[float, str]] = {}
+
+
+async def get_http_client(limits: httpx.Limits = HTTP2_LIMITS) -> httpx.AsyncClient:
+    """Get or create the running loop's shared HTTP/2 client for Reddit and Perspective.
+
+    *limits* only takes effect when the client is (re)created; an open client is
+    returned as-is. Content-Type is set per request because Reddit's token
+    endpoint is form-encoded. httpx builds the transport itself so proxies from
+    the environment (``HTTPS_PROXY``, ``NO_PROXY``, ...) still apply.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    # No await between the check and the insert, so concurrent callers on this
+    # loop can't both create a client.
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            http2=True, limits=limits, timeout=HTTP_TIMEOUT
+        )
+    return client
 
 
 async def close_http_client() -> None:
-    """Close the shared HTTP client and release resources."""
-    global _http_client
-    async with _http_client_lock:
-        if _http_client is not None and not _http_client.is_closed:
-            await _http_client.aclose()
-            _http_client = None
+    """Close the running loop's shared HTTP client and release its connections."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _purge_expired[K, V](cache: OrderedDict[K, tuple[float, V]], ttl: float, now: float) -> None:
+    """Drop expired entries from the least recently used end of *cache*.
+
+    At most a tenth of the entries are checked per call, so reads stay cheap
+    while results nobody asks for again stop holding slots past their TTL.
+    """
+    for key in list(itertools.islice(cache, max(1, len(cache) // 10))):
+        if now - cache[key][0] >= ttl:
+            del cache[key]
 
 
 async def get_cached_result(cache_key: str) -> ScanResult | None:
     """Return a cached ScanResult if still within TTL, otherwise None."""
     async with _cache_lock:
+        now = time.monotonic()
+        _purge_expired(_scan_cache, CACHE_TTL, now)
         if cache_key in _scan_cache:
             timestamp, result = _scan_cache[cache_key]
-            if time.monotonic() - timestamp < CACHE_TTL:
+            if now - timestamp < CACHE_TTL:
                 log.info("📦 Cache hit for '%s'", cache_key)
                 _scan_cache.move_to_end(cache_key)
                 return result
@@ -158,30 +244,297 @@ async def set_cached_result(cache_key: str, result: ScanResult) -> None:
         log.info("📦 Cached result for '%s'", cache_key)
 
 
+def _text_key(text: str) -> bytes:
+    """Return a compact content hash used to dedupe Perspective requests."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def get_cached_scores(key: bytes) -> ToxicityScores | None:
+    """Return cached Perspective scores for a text hash if still within TTL."""
+    if key in _score_cache:
+        timestamp, scores = _score_cache[key]
+        if time.monotonic() - timestamp < SCORE_CACHE_TTL:
+            _score_cache.move_to_end(key)
+            return scores
+        del _score_cache[key]
+    return None
+
+
+def set_cached_scores(key: bytes, scores: ToxicityScores) -> None:
+    """Store Perspective scores for a text hash, evicting the oldest if at capacity."""
+    if key in _score_cache:
+        del _score_cache[key]
+    elif len(_score_cache) >= SCORE_CACHE_MAX_SIZE:
+        _score_cache.popitem(last=False)
+    _score_cache[key] = (time.monotonic(), scores)
+
+
+@functools.cache
+def _probe_sherlock() -> tuple[bool, str | None]:
+    """Return (Python API importable, resolved CLI path); probed once per process (blocking)."""
+    return importlib.util.find_spec("sherlock_project") is not None, shutil.which("sherlock")
+
+
+def _has_sherlock_api() -> bool:
+    """Return True if the ``sherlock_project`` package is importable."""
+    return _probe_sherlock()[0]
+
+
+def _sherlock_path() -> str | None:
+    """Return the resolved ``sherlock`` executable, if any."""
+    return _probe_sherlock()[1]
+
+
+def _load_sherlock_site_data() -> dict[str, dict[str, Any]]:
+    """Load Sherlock's site manifest once per process (blocking).
+
+    Mirrors the CLI defaults: the upstream manifest with NSFW sites removed.
+    """
+    global _sherlock_site_data
+    with _sherlock_site_data_lock:
+        if _sherlock_site_data is None:
+            from sherlock_project.sites import SitesInformation
+
+            sites = SitesInformation()
+            sites.remove_nsfw_sites()
+            _sherlock_site_data = {site.name: site.information for site in sites}
+        return _sherlock_site_data
+
+
+async def _write_output(path: Path, data: bytes) -> None:
+    """Write a finished report to *path* from a worker thread."""
+    await asyncio.to_thread(path.write_bytes, data)
+
+
+def _write_json(path: Path, data: object, option: int | None = None) -> None:
+    """Serialise *data* with orjson and write it to *path* (blocking)."""
+    path.write_bytes(orjson.dumps(data, option=option))
+
+
+def _format_utc(ts: float) -> str:
+    """Format a Unix timestamp as ``YYYY-MM-DD HH:MM:SS`` in UTC."""
+    return (_EPOCH + timedelta(seconds=int(ts))).isoformat(sep=" ")
+
+
+def sanitize_username(username: str) -> str:
+    """Replace every character outside ``[\\w-]`` with ``_`` so *username* is path-safe."""
+    if username.isascii():
+        return username.translate(_USERNAME_SANITIZE_TABLE)
+    return _USERNAME_SANITIZE_RE.sub("_", username)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Return the delay requested by a ``Retry-After`` header, if any."""
+    if not (value := response.headers.get("Retry-After")):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+@functools.lru_cache(maxsize=8)
+def _perspective_urls(key: str) -> tuple[httpx.URL, str]:
+    """Return the analyze URL and batch request target for *key*, built once per key."""
+    query = urlencode({"key": key})
+    return httpx.URL(f"{PERSPECTIVE_URL}?{query}"), f"{PERSPECTIVE_BATCH_PATH}?{query}"
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so concurrent retries don't resynchronise."""
+    return RETRY_BACKOFF_BASE * 2.0**attempt + random.uniform(0, RETRY_BACKOFF_BASE)
+
+
+async def _retry_connect(
+    send: Callable[..., Awaitable[httpx.Response]], url: str, **kwargs: Any
+) -> httpx.Response:
+    """Call *send* (e.g. ``client.get``), retrying failed connection attempts.
+
+    A ConnectError means nothing reached the server, so retrying it
+    HTTP_CONNECT_RETRIES times is safe for any method.
+    """
+    for _ in range(HTTP_CONNECT_RETRIES):
+        try:
+            return await send(url, **kwargs)
+        except httpx.ConnectError as exc:
+            log.debug("Connect to %s failed (%r); retrying", url, exc)
+    return await send(url, **kwargs)
+
+
+async def _post_with_retry(
+    client: httpx.AsyncClient,
+    url: str | httpx.URL,
+    *,
+    limiter: "RateLimiter | None" = None,
+    admission: "AdmissionController | None" = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """POST *url*, retrying transient failures with exponential backoff.
+
+    Transport errors and 429/5xx responses are retried up to MAX_RETRIES times,
+    sleeping ``RETRY_BACKOFF_BASE * 2**attempt`` seconds plus jitter (or the
+    server's ``Retry-After``) between attempts. A ``Retry-After`` also pauses
+    *limiter*, so concurrent callers back off instead of hitting the same limit.
+    A 429 halves *admission*'s concurrency, at most once per retry delay, and
+    each 200 restores one slot.
+    Other responses are returned as-is; the last transport error is re-raised
+    once retries are exhausted.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.TransportError as exc:
+            if attempt >= MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt)
+            reason = type(exc).__name__
+        else:
+            if admission is not None and response.status_code == HTTP_OK:
+                await admission.succeeded()
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            retry_after = _retry_after_seconds(response)
+            delay = _backoff_delay(attempt) if retry_after is None else retry_after
+            if admission is not None and response.status_code == HTTP_TOO_MANY_REQUESTS:
+                await admission.throttled(min(delay, RETRY_MAX_DELAY))
+            if attempt >= MAX_RETRIES:
+                return response
+            if retry_after is not None and limiter is not None:
+                limiter.pause(min(retry_after, RETRY_MAX_DELAY))
+            reason = f"HTTP {response.status_code}"
+        delay = min(delay, RETRY_MAX_DELAY)
+        attempt += 1
+        log.warning(
+            "Perspective API %s; retrying in %.1fs (%d/%d)", reason, delay, attempt, MAX_RETRIES
+        )
+        await asyncio.sleep(delay)
+
+
 @dataclass(slots=True)
 class RateLimiter:
     """Token bucket rate limiter for API request throttling.
 
+    Up to ``burst`` requests may fire back-to-back; after that the bucket
+    refills at ``rate_per_min`` tokens per minute.
+
     Attributes:
-      rate_per_min: Maximum requests per minute allowed.
-      delay: Minimum seconds between consecutive requests (derived).
-      last_call: Monotonic timestamp of the most recent request.
+      rate_per_min: Sustained requests per minute allowed.
+      burst: Bucket capacity (requests allowed back-to-back).
+      delay: Seconds needed to refill a single token (derived).
+      tokens: Tokens currently available.
+      last_call: Monotonic timestamp of the most recent refill; pushed into the
+        future by ``pause()`` so the bucket stays empty until then.
     """
 
     rate_per_min: float
+    burst: float = DEFAULT_RATE_BURST
     delay: float = field(init=False)
+    capacity: float = field(init=False)
+    tokens: float = field(init=False)
     last_call: float = field(default=0.0, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.delay = 60.0 / self.rate_per_min
+        self.capacity = max(1.0, self.burst)
+        self.tokens = self.capacity
 
-    async def wait(self) -> None:
-        """Sleep only as long as necessary to honour the configured rate."""
+    def _refill(self) -> None:
         now = time.monotonic()
-        elapsed = now - self.last_call
-        if elapsed < self.delay:
-            await asyncio.sleep(self.delay - elapsed)
-        self.last_call = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_call) / self.delay)
+        self.last_call = now
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for *seconds*, e.g. after a server ``Retry-After``."""
+        resume_at = time.monotonic() + seconds
+        if resume_at > self.last_call:
+            self.tokens = min(self.tokens, 1.0)
+            self.last_call = resume_at
+
+    async def wait(self, count: int = 1) -> None:
+        """Take *count* tokens, sleeping only while the bucket is short.
+
+        Waiters queue on a lock so concurrent callers are admitted in FIFO order
+        instead of all observing the same stale refill timestamp. Requests larger
+        than the bucket are granted in capacity-sized steps under that one lock.
+        """
+        remaining = float(count)
+        async with self._lock:
+            self._refill()
+            while remaining > 0:
+                take = min(remaining, self.capacity)
+                # Loop: a pause() may land while this waiter is already sleeping.
+                while self.tokens < take:
+                    await asyncio.sleep((take - self.tokens) * self.delay)
+                    self._refill()
+                self.tokens -= take
+                remaining -= take
+
+
+@dataclass(slots=True)
+class AdmissionController:
+    """Concurrency limit that can be resized while callers are waiting.
+
+    Used as ``async with controller:`` like a semaphore, but ``limit`` halves
+    when the API throttles and grows back one slot per success (AIMD), without
+    touching semaphore internals. Throttles arriving within the backoff window
+    of the last decrease are one congestion event and do not halve again.
+
+    Attributes:
+      max_limit: Ceiling that ``limit`` recovers to.
+      limit: Callers currently admitted at once.
+      active: Callers inside the guarded block.
+    """
+
+    max_limit: int
+    limit: int = field(init=False)
+    active: int = field(default=0, init=False)
+    _cond: asyncio.Condition = field(default_factory=asyncio.Condition, init=False, repr=False)
+    _hold_until: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.max_limit = max(1, self.max_limit)
+        self.limit = self.max_limit
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def _set_limit(self, limit: int) -> None:
+        # Caller holds self._cond; clamps to 1..max_limit and wakes waiters it admits.
+        self.limit = min(self.max_limit, max(1, limit))
+        self._cond.notify_all()
+
+    async def throttled(self, hold: float) -> None:
+        """Halve the limit unless it was already halved within the last backoff window.
+
+        *hold* is how long the caller will back off; further throttles inside
+        that window are ignored.
+        """
+        async with self._cond:
+            now = time.monotonic()
+            if now < self._hold_until:
+                return
+            self._hold_until = now + hold
+            self._set_limit(self.limit // 2)
+
+    async def succeeded(self) -> None:
+        """Restore one slot after a successful call, up to max_limit."""
+        async with self._cond:
+            if self.limit < self.max_limit:
+                self._set_limit(self.limit + 1)
 
 
 @dataclass(slots=True)
@@ -195,13 +548,20 @@ class ScanConfig:
 
       Reddit configuration:
         api_key, client_id, client_secret, user_agent,
-        comments, posts, threshold, rate_per_min.
+        comments, posts, threshold, rate_per_min,
+        rate_burst — requests allowed back-to-back before rate_per_min pacing,
+        min_text_len — texts shorter than this (stripped) skip Perspective,
+        prescreen — optional pattern; texts it doesn't match skip Perspective,
+        http_limits — connection pool limits for the shared HTTP client,
+        max_concurrency — ceiling on Perspective requests in flight (halved on 429).
 
       Sherlock configuration:
         sherlock_timeout — subprocess timeout in seconds.
 
       Output configuration:
-        output_reddit, output_sherlock, verbose.
+        output_reddit (CSV, or a JSON array if it ends in .json),
+        output_sherlock, verbose,
+        pretty — indent the Sherlock JSON file (compact by default).
     """
 
     username: str
@@ -216,84 +576,116 @@ class ScanConfig:
     posts: int = 20
     threshold: float = 0.7
     rate_per_min: float = 60.0
+    rate_burst: float = DEFAULT_RATE_BURST
+    min_text_len: int = 3
+    prescreen: re.Pattern[str] | None = None
+    http_limits: httpx.Limits = field(default_factory=lambda: HTTP2_LIMITS)
+    max_concurrency: int = MAX_CONCURRENT_API_CALLS
     # Sherlock
     sherlock_timeout: int = 120
     # Output
     output_reddit: Path = field(default_factory=lambda: Path("reddit_flagged.csv"))
     output_sherlock: Path = field(default_factory=lambda: Path("sherlock_results.json"))
     verbose: bool = False
+    pretty: bool = False
 
     def __post_init__(self) -> None:
         # Sanitise username to prevent path traversal (alphanumeric, _ and - only).
-        self.username = _USERNAME_SANITIZE_RE.sub("_", self.username)
+        self.username = sanitize_username(self.username)
         if not self.user_agent:
             self.user_agent = f"account-scanner/1.2.3 (by u/{self.username})"
 
 
+class _SherlockCancelledError(Exception):
+    """Raised from Sherlock's notify hook to stop an in-process run early."""
+
+
 class SherlockScanner:
     """Handles Sherlock OSINT username enumeration across platforms."""
 
     @staticmethod
     async def available() -> bool:
-        """Check whether Sherlock is installed (result is cached)."""
-        global _sherlock_available
-        if (cached := _sherlock_available) is not None:
-            return cached
-        async with _sherlock_lock:
-            if (cached := _sherlock_available) is not None:
-                return cached
-            path = await asyncio.to_thread(shutil.which, "sherlock")
-            _sherlock_available = path is not None
-            return _sherlock_available
+        """Check whether Sherlock is installed as a library or CLI (result is cached)."""
+        has_api, path = await asyncio.to_thread(_probe_sherlock)
+        return has_api or path is not None
 
     @staticmethod
     def available_sync() -> bool:
-        """Synchronous availability check, safe outside an event loop.
-
-        Uses a dedicated threading.Lock so it never touches asyncio primitives,
-        avoiding event-loop binding issues.
-        """
-        global _sherlock_available
-        with _sherlock_available_thread_lock:
-            if _sherlock_available is not None:
-                return _sherlock_available
-            result = shutil.which("sherlock") is not None
-            _sherlock_available = result
-            return result
+        """Synchronous availability check, safe outside an event loop."""
+        has_api, path = _probe_sherlock()
+        return has_api or path is not None
 
     @staticmethod
-    def _extract_accounts(text: str) -> Iterator[tuple[str, str]]:
-        """Yield (platform, url) pairs from Sherlock stdout text."""
-        for raw_line in text.splitlines():
-            stripped = raw_line.strip()
-            if "://" not in stripped or ": " not in stripped:
-                continue
-            if "]:  " in stripped:
-                _, stripped = stripped.split("]: ", 1)
-            parts = stripped.split(": ", 1)
-            if len(parts) < 2:
-                continue
-            platform, url = parts
-            url = url.strip()
-            platform = platform.strip(" +[]")
-            if not url.startswith("http"):
-                continue
-            yield platform, url
+    def _extract_accounts(text: str | bytes) -> Iterator[tuple[str, str]]:
+        """Yield (platform, url) pairs from Sherlock stdout.
+
+        Raw bytes are scanned directly and only the matched groups are decoded.
+        """
+        if isinstance(text, bytes):
+            for raw in _SHERLOCK_LINE_BYTES_RE.finditer(text):
+                platform, url = raw.group(1, 2)
+                yield platform.decode(errors="ignore").strip(" +[]"), url.decode(errors="ignore")
+            return
+        for match in _SHERLOCK_LINE_RE.finditer(text):
+            yield match.group(1).strip(" +[]"), match.group(2)
 
     @staticmethod
-    def _parse_stdout(text: str) -> list[SherlockResult]:
-        """Parse Sherlock stdout into a list of SherlockResult entries."""
-        seen: set[tuple[str, str]] = set()
-        results: list[SherlockResult] = []
+    def _collect(results: dict[tuple[str, str], SherlockResult], text: str | bytes) -> None:
+        """Add accounts found in *text* to *results*, keeping the first of each duplicate."""
         for platform, url in SherlockScanner._extract_accounts(text):
             key = (platform.lower(), url)
-            if key in seen:
-                continue
-            seen.add(key)
-            results.append(
-                SherlockResult(platform=platform, url=url, status="Claimed", response_time=None)
-            )
-        return results
+            if key not in results:
+                results[key] = SherlockResult(
+                    platform=platform, url=url, status="Claimed", response_time=None
+                )
+
+    @staticmethod
+    def _parse_stdout(text: str | bytes) -> list[SherlockResult]:
+        """Parse Sherlock stdout (raw bytes or decoded text) into SherlockResult entries."""
+        results: dict[tuple[str, str], SherlockResult] = {}
+        SherlockScanner._collect(results, text)
+        return list(results.values())
+
+    @staticmethod
+    def _run_in_process(
+        username: str,
+        timeout_seconds: int,
+        verbose: bool,
+        found: list[SherlockResult],
+        cancel: threading.Event,
+    ) -> None:
+        """Query every site through Sherlock's Python API (blocking).
+
+        Claimed accounts are appended to *found* as results arrive. Once *cancel*
+        is set the run stops at the next result; requests Sherlock has already
+        sent still finish within their per-request timeout.
+        Raises ImportError when the ``sherlock_project`` package is not installed.
+        """
+        from sherlock_project.notify import QueryNotify
+        from sherlock_project.result import QueryStatus
+        from sherlock_project.sherlock import sherlock
+
+        class _Notify(QueryNotify):  # type: ignore[misc]
+            def update(self, result: Any) -> None:
+                if cancel.is_set():
+                    raise _SherlockCancelledError
+                if result.status != QueryStatus.CLAIMED:
+                    return
+                found.append(
+                    SherlockResult(
+                        platform=result.site_name,
+                        url=str(result.site_url_user),
+                        status="Claimed",
+                        response_time=result.query_time,
+                    )
+                )
+                if verbose:
+                    log.info("🔎 Sherlock: [+] %s: %s", result.site_name, result.site_url_user)
+
+        try:
+            sherlock(username, _load_sherlock_site_data(), _Notify(), timeout=timeout_seconds)
+        except _SherlockCancelledError:
+            pass
 
     async def scan(
         self,
@@ -302,10 +694,100 @@ class SherlockScanner:
         verbose: bool,
         output_dir: Path | None = None,
     ) -> list[SherlockResult]:
-        """Run Sherlock for *username* and return parsed results."""
+        """Run Sherlock for *username* and return parsed results.
+
+        Uses the in-process Python API when ``sherlock_project`` is importable,
+        falling back to the ``sherlock`` CLI otherwise. As with the CLI's
+        ``--timeout``, *timeout_seconds* bounds each site request; the whole run
+        is stopped ``SHERLOCK_BUFFER`` seconds later, keeping accounts found so far.
+        """
         log.info("🔎 Sherlock:  Scanning '%s'...", username)
+        if not _has_sherlock_api():
+            return await self._scan_subprocess(username, timeout_seconds, verbose, output_dir)
+        found: list[SherlockResult] = []
+        cancel = threading.Event()
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(
+                    self._run_in_process, username, timeout_seconds, verbose, found, cancel
+                ),
+                timeout=timeout_seconds + SHERLOCK_BUFFER,
+            )
+        except ImportError:
+            log.warning("🔎 Sherlock: Python API failed to import; using CLI", exc_info=True)
+            return await self._scan_subprocess(username, timeout_seconds, verbose, output_dir)
+        except TimeoutError:
+            log.warning("🔎 Sherlock: timed out after %ds; using partial results", timeout_seconds)
+        except (OSError, ValueError, RuntimeError):
+            log.exception("🔎 Sherlock error")
+            return []
+        finally:
+            # The worker thread cannot be interrupted; this stops it at the next result.
+            cancel.set()
+        results = list(found)
+
+        if output_dir:
+            report = "".join(f"{r['url']}\n" for r in results)
+            report += f"Total Websites Username Detected On : {len(results)}\n"
+            try:
+                await _write_output(output_dir / f"{username}.txt", report.encode("utf-8"))
+            except OSError:
+                log.exception("🔎 Sherlock: failed to write report")
+        log.info(
+            "🔎 Sherlock: %s",
+            f"collected {len(results)} claimed accounts"
+            if results
+            else "no claimed accounts found",
+        )
+        return results
+
+    @staticmethod
+    def _signal_group(proc: asyncio.subprocess.Process, sig: signal.Signals) -> bool:
+        """Send *sig* to Sherlock's process group; return False if it already exited.
+
+        Sherlock runs in its own session on POSIX, so this also reaches any
+        workers it spawned. Windows has neither process groups nor graceful
+        signals, so the process itself is terminated.
+        """
+        if proc.returncode is not None:
+            return False
+        try:
+            if sys.platform == "win32":
+                proc.kill()
+            else:
+                os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return False
+        return True
+
+    async def _terminate(self, proc: asyncio.subprocess.Process) -> None:
+        """Stop Sherlock with SIGTERM, escalating to SIGKILL after a grace period."""
+        if not self._signal_group(proc, signal.SIGTERM):
+            return
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=SHERLOCK_TERM_GRACE)
+            return
+        except TimeoutError:
+            pass
+        if not self._signal_group(proc, _SIGKILL):
+            return
+        # wait() also waits for the pipes to close, which a lingering child
+        # process can hold open; the kill itself is what matters here.
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=SHERLOCK_PARTIAL_READ_TIMEOUT)
+        except TimeoutError:
+            log.debug("🔎 Sherlock: pipes still open after kill")
+
+    async def _scan_subprocess(
+        self,
+        username: str,
+        timeout_seconds: int,
+        verbose: bool,
+        output_dir: Path | None = None,
+    ) -> list[SherlockResult]:
+        """Run the ``sherlock`` CLI for *username* and parse its stdout."""
         cmd = [
-            "sherlock",
+            _sherlock_path() or "sherlock",
             "--timeout",
             str(timeout_seconds),
             "--no-color",
@@ -315,82 +797,62 @@ class SherlockScanner:
             cmd.extend(["--output", str(output_dir / f"{username}.txt")])
         cmd.extend(["--", username])
 
-        async def _read_stream(stream: asyncio.StreamReader | None) -> bytes:
-            return (await stream.read()) if stream is not None else b""
-
+        proc: asyncio.subprocess.Process | None = None
+        readers: tuple[asyncio.Task[Any], ...] = ()
         try:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                limit=SHERLOCK_LINE_LIMIT,
+                start_new_session=True,
             )
-            # Start background readers immediately.  They are NOT cancelled on timeout,
-            # so every byte Sherlock emits is preserved.  After proc.kill(), the OS
-            # closes the write end of both pipes → EOF → the readers complete naturally
-            # with all accumulated data.
-            stdout_task: asyncio.Task[bytes] = asyncio.create_task(_read_stream(proc.stdout))
-            stderr_task: asyncio.Task[bytes] = asyncio.create_task(_read_stream(proc.stderr))
-
+            # Stdout is parsed line by line as Sherlock prints it, so every account
+            # read before a timeout or kill is kept even if the pipe never reaches EOF.
+            # Stderr is drained concurrently so neither pipe can fill and stall.
+            found: dict[tuple[str, str], SherlockResult] = {}
+            echoed: list[bytes] = []
+
+            async def _drain_stdout(stream: asyncio.StreamReader | None) -> None:
+                if stream is None:
+                    return
+                async for line in stream:
+                    self._collect(found, line)
+                    if verbose:
+                        echoed.append(line)
+
+            async def _read_stream(stream: asyncio.StreamReader | None) -> bytes:
+                return (await stream.read()) if stream is not None else b""
+
+            stderr_task = asyncio.create_task(_read_stream(proc.stderr))
+            stdout_task = asyncio.create_task(_drain_stdout(proc.stdout))
+            readers = (stdout_task, stderr_task)
             timed_out = False
             try:
                 await asyncio.wait_for(proc.wait(), timeout=timeout_seconds + SHERLOCK_BUFFER)
-                stdout = await stdout_task
-                stderr = await stderr_task
             except TimeoutError:
                 timed_out = True
-                if proc.returncode is None:
-                    try:
-                        proc.kill()
-                    except ProcessLookupError:
-                        log.debug(
-                            "🔎 Sherlock: process exited before kill during timeout recovery",
-                            exc_info=True,
-                        )
-                await proc.wait()
-                # Readers get EOF from the killed process and complete with partial data.
-                try:
-                    stdout = await asyncio.wait_for(
-                        stdout_task, timeout=SHERLOCK_PARTIAL_READ_TIMEOUT
-                    )
-                except SHERLOCK_PARTIAL_READ_EXCEPTIONS as exc:
-                    stdout_task.cancel()
-                    try:
-                        await stdout_task
-                    except asyncio.CancelledError:
-                        pass
-                    stdout = b""
-                    log.debug(
-                        "🔎 Sherlock: failed to recover partial stdout: %s",
-                        type(exc).__name__,
-                        exc_info=True,
-                    )
-                try:
-                    stderr = await asyncio.wait_for(
-                        stderr_task, timeout=SHERLOCK_PARTIAL_READ_TIMEOUT
-                    )
-                except SHERLOCK_PARTIAL_READ_EXCEPTIONS as exc:
-                    stderr_task.cancel()
-                    try:
-                        await stderr_task
-                    except asyncio.CancelledError:
-                        pass
-                    stderr = b""
-                    log.debug(
-                        "🔎 Sherlock: failed to recover partial stderr: %s",
-                        type(exc).__name__,
-                        exc_info=True,
-                    )
+                await self._terminate(proc)
                 log.warning(
                     "🔎 Sherlock: timed out after %ds; using partial results",
                     timeout_seconds,
                 )
-
-            if stderr_text := stderr.decode(errors="ignore").strip():
-                log.warning("🔎 Sherlock stderr:\n%s", stderr_text)
-            if verbose and stdout:
-                log.info("🔎 Sherlock stdout:\n%s", stdout.decode(errors="ignore"))
-
-            results = self._parse_stdout(stdout.decode(errors="ignore")) if stdout else []
+            # After exit the pipes normally hit EOF at once; don't hang if a child
+            # process still holds them open.
+            done, pending = await asyncio.wait(readers, timeout=SHERLOCK_PARTIAL_READ_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                if (exc := task.exception()) is not None:
+                    log.debug("🔎 Sherlock: failed to read output: %r", exc)
+            stderr = b""
+            if stderr_task in done and stderr_task.exception() is None:
+                stderr = stderr_task.result().strip()
+            if stderr:
+                log.warning("🔎 Sherlock stderr:\n%s", stderr.decode(errors="ignore"))
+            if verbose and echoed:
+                log.info("🔎 Sherlock stdout:\n%s", b"".join(echoed).decode(errors="ignore"))
+            results = list(found.values())
 
             if not timed_out and proc.returncode is not None and proc.returncode != 0:
                 log.error("🔎 Sherlock: process exited with code %d", proc.returncode)
@@ -406,18 +868,64 @@ class SherlockScanner:
             return []
         except asyncio.CancelledError:
             log.warning("🔎 Sherlock: scan cancelled")
+            if proc is not None:
+                # No awaiting while cancelled: kill outright rather than escalate.
+                self._signal_group(proc, _SIGKILL)
+            for task in readers:
+                task.cancel()
             raise
         except (ValueError, RuntimeError):
             log.exception("🔎 Sherlock error")
             return []
 
 
+class PerspectiveAuthError(RuntimeError):
+    """Raised when the Perspective API rejects the configured key."""
+
+
 class RedditScanner:
     """Handles Reddit content fetching and toxicity analysis."""
 
     def __init__(self, config: ScanConfig) -> None:
         self.config = config
-        self.limiter: RateLimiter = config.limiter or RateLimiter(config.rate_per_min)
+        self.limiter: RateLimiter = config.limiter or RateLimiter(
+            config.rate_per_min, burst=config.rate_burst
+        )
+        # Bounds Perspective fan-out at the task level rather than by pool exhaustion,
+        # narrowing while the API answers 429.
+        self._admission = AdmissionController(config.max_concurrency)
+        # Set on the first 401/403 so no further requests spend rate-limit tokens.
+        self._auth_error: PerspectiveAuthError | None = None
+
+    @staticmethod
+    def _build_payload(text: str) -> bytes:
+        """Serialise the Perspective request body for *text*.
+
+        Only the comment text is encoded per call; the static remainder of the
+        payload is spliced in from pre-serialised module constants.
+        """
+        return _PAYLOAD_HEAD + orjson.dumps(text) + _PAYLOAD_TAIL
+
+    @staticmethod
+    def _extract_scores(data: dict[str, Any]) -> ToxicityScores:
+        """Pull summary scores for the requested ATTRIBUTES out of a Perspective response."""
+        attribute_scores = data.get("attributeScores") or {}
+        return {
+            a: attribute_scores[a]["summaryScore"]["value"]
+            for a in ATTRIBUTES
+            if a in attribute_scores
+        }
+
+    def _raise_for_auth(self, resp: httpx.Response) -> None:
+        """Raise PerspectiveAuthError if *resp* shows the API key was rejected."""
+        if resp.status_code not in (HTTP_UNAUTHORIZED, HTTP_FORBIDDEN):
+            return
+        if self._auth_error is None:
+            log.error("Perspective API rejected the key (HTTP %d)", resp.status_code)
+        self._auth_error = PerspectiveAuthError(
+            f"Perspective API rejected the key (HTTP {resp.status_code})"
+        )
+        raise self._auth_error
 
     async def _check_toxicity(
         self,
@@ -425,68 +933,172 @@ class RedditScanner:
         text: str,
         key: str,
     ) -> ToxicityScores:
-        """Analyse *text* with the Perspective API and return attribute scores."""
+        """Analyse *text* with the Perspective API and return attribute scores.
+
+        Raises:
+            PerspectiveAuthError: If the API rejects *key*.
+        """
         if not text.strip():
             return {}
         await self.limiter.wait()
-        payload = {
-            "comment": {"text": text},
-            "languages": ["en"],
-            "requestedAttributes": {a: {} for a in ATTRIBUTES},
-        }
         try:
-            resp = await client.post(
-                PERSPECTIVE_URL,
-                params={"key": key},
-                content=orjson.dumps(payload),
-                timeout=DEFAULT_TIMEOUT,
+            resp = await _post_with_retry(
+                client,
+                _perspective_urls(key)[0],
+                content=self._build_payload(text),
+                headers=JSON_HEADERS,
+                limiter=self.limiter,
+                admission=self._admission,
             )
+            self._raise_for_auth(resp)
             if resp.status_code == HTTP_OK:
-                data = orjson.loads(resp.content)
-                return {
-                    k: v["summaryScore"]["value"]
-                    for k, v in data.get("attributeScores", {}).items()
-                }
+                return self._extract_scores(orjson.loads(resp.content))
         except httpx.HTTPError as exc:
             log.warning("Perspective API HTTP error; returning empty scores: %s", exc)
         except (orjson.JSONDecodeError, KeyError, TypeError) as exc:
             log.warning("Perspective API parse error; returning empty scores: %s", exc)
         return {}
 
-    async def _get_access_token(self, client: httpx.AsyncClient) -> str:
+    @staticmethod
+    def _build_batch_envelope(texts: list[str], key: str) -> bytes:
+        """Build a multipart/mixed batch body with one analyze request per text.
+
+        Each part's Content-ID carries the index into *texts* so responses can be
+        matched back regardless of the order the server returns them in.
+        """
+        request_head = (
+            f">\r\n\r\nPOST {_perspective_urls(key)[1]} HTTP/1.1\r\n"
+            "Content-Type: application/json\r\n\r\n"
+        ).encode() + _PAYLOAD_HEAD
+        parts: list[bytes] = []
+        for index, text in enumerate(texts):
+            parts += (
+                _BATCH_PART_HEAD,
+                str(index).encode(),
+                request_head,
+                orjson.dumps(text),
+                _BATCH_PART_TAIL,
+            )
+        parts.append(_BATCH_CLOSE)
+        return b"".join(parts)
+
+    @staticmethod
+    def _parse_batch_response(
+        content_type: str, body: bytes, count: int
+    ) -> list[ToxicityScores | None]:
+        """Split a multipart/mixed batch response into per-item scores.
+
+        Parts that are missing, non-200 or malformed yield None so the caller
+        can score them again.
+        """
+        scores: list[ToxicityScores | None] = [None] * count
+        if not (match := _BOUNDARY_RE.search(content_type)):
+            raise ValueError("Perspective batch response missing multipart boundary")
+        delimiter = b"--" + match.group(1).encode()
+        for part in body.replace(b"\r\n", b"\n").split(delimiter):
+            outer_headers, _, inner = part.partition(b"\n\n")
+            if not (id_match := _CONTENT_ID_RE.search(outer_headers)):
+                continue
+            index = int(id_match.group(1))
+            if not 0 <= index < count:
+                continue
+            status_block, _, payload = inner.partition(b"\n\n")
+            status_line = status_block.split(b"\n", 1)[0].split()
+            if len(status_line) < 2 or status_line[1] != str(HTTP_OK).encode():
+                log.warning("Perspective batch item %d failed: %s", index, status_block[:80])
+                continue
+            try:
+                scores[index] = RedditScanner._extract_scores(orjson.loads(payload))
+            except (orjson.JSONDecodeError, KeyError, TypeError) as exc:
+                log.warning("Perspective batch item %d parse error: %s", index, exc)
+        return scores
+
+    async def _check_toxicity_batch(
+        self,
+        client: httpx.AsyncClient,
+        texts: list[str],
+        key: str,
+    ) -> list[ToxicityScores]:
+        """Analyse up to PERSPECTIVE_BATCH_SIZE texts with a single batch request.
+
+        The limiter is charged one token per analysed text, taken in a single
+        acquisition, because Perspective counts every part of a batch against
+        the per-comment QPS quota. Items whose part failed are scored again
+        one by one through ``_check_toxicity``, which retries with backoff.
+
+        Raises:
+            PerspectiveAuthError: If the API rejects *key*.
+        """
+        if len(texts) == 1:
+            return [await self._check_toxicity(client, texts[0], key)]
+        scores: list[ToxicityScores] = [{} for _ in texts]
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        if not pending:
+            return scores
+        await self.limiter.wait(len(pending))
+        try:
+            resp = await _post_with_retry(
+                client,
+                PERSPECTIVE_BATCH_URL,
+                content=self._build_batch_envelope([texts[i] for i in pending], key),
+                headers={"Content-Type": f"multipart/mixed; boundary={PERSPECTIVE_BATCH_BOUNDARY}"},
+                limiter=self.limiter,
+                admission=self._admission,
+            )
+            self._raise_for_auth(resp)
+            if resp.status_code != HTTP_OK:
+                log.warning("Perspective batch HTTP %d; returning empty scores", resp.status_code)
+                return scores
+            parsed = self._parse_batch_response(
+                resp.headers.get("Content-Type", ""), resp.content, len(pending)
+            )
+        except httpx.HTTPError as exc:
+            log.warning("Perspective batch HTTP error; returning empty scores: %s", exc)
+            return scores
+        except ValueError as exc:
+            log.warning("Perspective batch parse error; returning empty scores: %s", exc)
+            return scores
+        for index, item_scores in zip(pending, parsed, strict=True):
+            if item_scores is None:
+                item_scores = await self._check_toxicity(client, texts[index], key)
+            scores[index] = item_scores
+        return scores
+
+    async def _get_access_token(self, client: httpx.AsyncClient, headers: dict[str, str]) -> str:
+        """Return an application-only OAuth token, reusing it until shortly before expiry."""
         cfg = self.config
         if not cfg.client_id or not cfg.client_secret:
             raise ValueError("Reddit API credentials are required")
-        response = await client.post(
+        if (cached := _reddit_tokens.get(cfg.client_id)) and cached[0] > time.monotonic():
+            return cached[1]
+        response = await _retry_connect(
+            client.post,
             "https://www.reddit.com/api/v1/access_token",
             auth=(cfg.client_id, cfg.client_secret),
             data={"grant_type": "client_credentials"},
-            timeout=DEFAULT_TIMEOUT,
+            headers=headers,
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         token = data.get("access_token")
         if not (isinstance(token, str) and token):
             raise ValueError("Reddit access token missing from API response")
+        expires_in = data.get("expires_in")
+        if isinstance(expires_in, (int, float)) and expires_in > REDDIT_TOKEN_MARGIN:
+            _reddit_tokens[cfg.client_id] = (
+                time.monotonic() + expires_in - REDDIT_TOKEN_MARGIN,
+                token,
+            )
         return token
 
-    async def _fetch_listing(
-        self,
-        client: httpx.AsyncClient,
-        path: str,
-        limit: int,
-    ) -> list[tuple[str, str, str, float]]:
-        response = await client.get(
-            f"https://oauth.reddit.com/user/{self.config.username}/{path}",
-            params={"sort": "new", "limit": limit, "raw_json": 1},
-            timeout=DEFAULT_TIMEOUT,
-        )
-        response.raise_for_status()
-        payload = response.json()
-        children = payload.get("data", {}).get("children", [])
-        if not isinstance(children, list):
-            raise ValueError("Reddit listing response missing children")
-        items: list[tuple[str, str, str, float]] = []
+    @staticmethod
+    def _parse_children(path: str, children: list[Any]) -> list[RedditItem]:
+        """Convert raw listing children into RedditItem tuples.
+
+        Malformed children and deleted/removed comments are skipped; a removed
+        post keeps its title.
+        """
+        items: list[RedditItem] = []
         for child in children:
             if not isinstance(child, dict):
                 continue
@@ -499,12 +1111,14 @@ class RedditScanner:
                 continue
             if path == "comments":
                 body = data.get("body")
-                if isinstance(body, str):
+                if isinstance(body, str) and body not in REDDIT_PLACEHOLDERS:
                     items.append(("comment", subreddit, body, float(created_utc)))
             else:
                 title = data.get("title")
                 selftext = data.get("selftext")
                 if isinstance(title, str) and isinstance(selftext, str):
+                    if selftext in REDDIT_PLACEHOLDERS:
+                        selftext = ""
                     if not title and not selftext:
                         continue
                     has_title = bool(title)
@@ -515,84 +1129,214 @@ class RedditScanner:
                     items.append(("post", subreddit, content, float(created_utc)))
         return items
 
-    async def _fetch_comments(self, client: httpx.AsyncClient) -> list[tuple[str, str, str, float]]:
-        return await self._fetch_listing(client, "comments", self.config.comments)
-
-    async def _fetch_posts(self, client: httpx.AsyncClient) -> list[tuple[str, str, str, float]]:
-        return await self._fetch_listing(client, "submitted", self.config.posts)
+    async def _fetch_listing(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict[str, str],
+        path: str,
+        limit: int,
+    ) -> AsyncIterator[list[RedditItem]]:
+        """Yield parsed pages of a user listing until *limit* items have been requested.
 
-    async def _fetch_items(self) -> list[tuple[str, str, str, float]] | None:
-        """Fetch Reddit comments and posts concurrently via TaskGroup."""
+        Reddit caps each request at REDDIT_PAGE_SIZE items, so larger limits follow
+        the listing's ``after`` cursor.
+        """
+        after: str | None = None
+        remaining = limit
+        while remaining > 0:
+            params: dict[str, str | int] = {
+                "sort": "new",
+                "limit": min(remaining, REDDIT_PAGE_SIZE),
+                "raw_json": 1,
+            }
+            if after:
+                params["after"] = after
+            response = await _retry_connect(
+                client.get,
+                f"https://oauth.reddit.com/user/{self.config.username}/{path}",
+                params=params,
+                headers=headers,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content).get("data", {})
+            children = data.get("children", [])
+            if not isinstance(children, list):
+                raise ValueError("Reddit listing response missing children")
+            yield self._parse_children(path, children)
+            remaining -= len(children)
+            after = data.get("after")
+            if not children or not isinstance(after, str):
+                break
+
+    def _fetch_comments(
+        self, client: httpx.AsyncClient, headers: dict[str, str]
+    ) -> AsyncIterator[list[RedditItem]]:
+        return self._fetch_listing(client, headers, "comments", self.config.comments)
+
+    def _fetch_posts(
+        self, client: httpx.AsyncClient, headers: dict[str, str]
+    ) -> AsyncIterator[list[RedditItem]]:
+        return self._fetch_listing(client, headers, "submitted", self.config.posts)
+
+    async def _iter_listings(self) -> AsyncIterator[list[RedditItem]]:
+        """Yield pages of comments and posts as each Reddit request completes.
+
+        Both listings are paged concurrently into a queue; callers can start
+        analysing whichever page arrives first. Fetch errors are logged and end
+        the stream, so pages already yielded are still usable.
+        """
         cfg = self.config
         log.info("🤖 Reddit: Fetching content for u/%s...", cfg.username)
-        items: list[tuple[str, str, str, float]] | None = None
         if not cfg.user_agent:
             log.error("Reddit fetch error: missing Reddit user agent")
-            return None
+            return
+        headers = {"User-Agent": cfg.user_agent}
+        pages: asyncio.Queue[list[RedditItem] | None] = asyncio.Queue()
+
+        async def pump(source: AsyncIterator[list[RedditItem]]) -> None:
+            try:
+                async for page in source:
+                    pages.put_nowait(page)
+            finally:
+                pages.put_nowait(None)
+
         try:
-            async with httpx.AsyncClient(headers={"User-Agent": cfg.user_agent}) as client:
-                token = await self._get_access_token(client)
-                client.headers["Authorization"] = f"Bearer {token}"
-                async with asyncio.TaskGroup() as tg:
-                    comments_t = tg.create_task(self._fetch_comments(client))
-                    posts_t = tg.create_task(self._fetch_posts(client))
-                merged = comments_t.result() + posts_t.result()
-                items = merged if merged else None
-        except* httpx.HTTPStatusError as status_group:
-            for status_error in status_group.exceptions:
-                log.error("Reddit API Error: %s", status_error)
-        except* httpx.HTTPError as http_group:
-            for http_error in http_group.exceptions:
-                log.error("Reddit HTTP error: %s", http_error)
-        except* (OSError, ValueError, RuntimeError) as fetch_group:
-            for fetch_error in fetch_group.exceptions:
-                log.error("Reddit fetch error: %s", fetch_error)
-        return items
+            client = await get_http_client(self.config.http_limits)
+            token = await self._get_access_token(client, headers)
+            headers["Authorization"] = f"Bearer {token}"
+            tasks = [
+                asyncio.create_task(pump(self._fetch_comments(client, headers))),
+                asyncio.create_task(pump(self._fetch_posts(client, headers))),
+            ]
+            try:
+                running = len(tasks)
+                while running:
+                    if (page := await pages.get()) is None:
+                        running -= 1
+                    else:
+                        yield page
+                for task in tasks:
+                    task.result()
+            finally:
+                for task in tasks:
+                    task.cancel()
+        except httpx.HTTPStatusError as status_error:
+            if status_error.response.status_code == HTTP_UNAUTHORIZED and cfg.client_id:
+                _reddit_tokens.pop(cfg.client_id, None)
+            log.error("Reddit API Error: %s", status_error)
+        except httpx.HTTPError as http_error:
+            log.error("Reddit HTTP error: %s", http_error)
+        except (OSError, ValueError, RuntimeError) as fetch_error:
+            log.error("Reddit fetch error: %s", fetch_error)
+
+    @staticmethod
+    def _write_csv(path: Path, flagged: list[RedditFlaggedItem]) -> None:
+        """Write *flagged* rows to *path* as CSV in CSV_FIELDS order (blocking)."""
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(
+                [
+                    (
+                        row["timestamp"],
+                        row["type"],
+                        row["subreddit"],
+                        row["content"],
+                        *[row.get(a, "") for a in ATTRIBUTES],
+                    )
+                    for row in flagged
+                ]
+            )
 
     async def scan(self) -> list[RedditFlaggedItem] | None:
-        """Scan the configured Reddit user's content for toxic language."""
-        items = await self._fetch_items()
-        if not items:
+        """Scan the configured Reddit user's content for toxic language.
+
+        Perspective batches for each Reddit page are dispatched as soon as that
+        page arrives, overlapping analysis with the remaining Reddit fetches.
+
+        Raises:
+            PerspectiveAuthError: If the API rejects the key; batches still in
+                flight are cancelled rather than spending their rate-limit tokens.
+        """
+        client = await get_http_client(self.config.http_limits)
+
+        async def throttled_check(batch: list[str]) -> list[ToxicityScores]:
+            async with self._admission:
+                if self._auth_error is not None:
+                    return [{} for _ in batch]
+                return await self._check_toxicity_batch(client, batch, self.config.api_key or "")
+
+        # Identical texts (reposts, copypasta) are analysed once: per scan via
+        # `queued`, and across scans via the process-wide score cache.
+        scores_by_key: dict[bytes, ToxicityScores] = {}
+        queued: set[bytes] = set()
+        listings: list[tuple[list[RedditItem], list[bytes]]] = []
+        batch_tasks: list[tuple[list[bytes], asyncio.Task[list[ToxicityScores]]]] = []
+        try:
+            async with asyncio.TaskGroup() as tg:
+                async for listing in self._iter_listings():
+                    if not listing:
+                        continue
+                    keys = [_text_key(text) for _, _, text, _ in listing]
+                    listings.append((listing, keys))
+                    fresh: list[tuple[bytes, str]] = []
+                    for key, (_, _, text, _) in zip(keys, listing, strict=True):
+                        if key in scores_by_key or key in queued:
+                            continue
+                        if len(text.strip()) < self.config.min_text_len:
+                            # Too short to score meaningfully; skip the request and its token.
+                            scores_by_key[key] = {}
+                            continue
+                        if self.config.prescreen and not self.config.prescreen.search(text):
+                            scores_by_key[key] = {}
+                            continue
+                        if (cached := get_cached_scores(key)) is not None:
+                            scores_by_key[key] = cached
+                        else:
+                            queued.add(key)
+                            fresh.append((key, text))
+                    log.info(
+                        "🤖 Reddit:  Analyzing %d items (%d reused)...",
+                        len(fresh),
+                        len(listing) - len(fresh),
+                    )
+                    for batch in itertools.batched(fresh, PERSPECTIVE_BATCH_SIZE, strict=False):
+                        batch_keys = [key for key, _ in batch]
+                        task = tg.create_task(throttled_check([text for _, text in batch]))
+                        batch_tasks.append((batch_keys, task))
+        except* PerspectiveAuthError as group:
+            raise group.exceptions[0] from None
+        if not listings:
             log.info("🤖 Reddit: No items to analyze")
             return None
-        log.info("🤖 Reddit:  Analyzing %d items...", len(items))
-        client = await get_http_client()
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_CALLS)
-
-        async def throttled_check(text: str) -> ToxicityScores:
-            async with semaphore:
-                result = await self._check_toxicity(client, text, self.config.api_key or "")
-                await asyncio.sleep(0)  # Yield to prevent blocking the Discord heartbeat
-                return result
 
-        score_tasks: list[asyncio.Task[ToxicityScores]] = []
-        async with asyncio.TaskGroup() as tg:
-            score_tasks = [tg.create_task(throttled_check(text)) for _, _, text, _ in items]
-        scores = [t.result() for t in score_tasks]
+        for batch_keys, task in batch_tasks:
+            for key, item_scores in zip(batch_keys, task.result(), strict=True):
+                scores_by_key[key] = item_scores
+                if item_scores:
+                    set_cached_scores(key, item_scores)
+
+        listings.sort(key=lambda entry: entry[0][0][0] != "comment")
+        items = [item for listing, _ in listings for item in listing]
+        scores = [scores_by_key[key] for _, keys in listings for key in keys]
 
         flagged: list[RedditFlaggedItem] = []
         for (kind, sub, text, ts), item_scores in zip(items, scores, strict=True):
-            if any(s >= self.config.threshold for s in item_scores.values()):
-                dt = datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
+            if item_scores and max(item_scores.values()) >= self.config.threshold:
                 entry: RedditFlaggedItem = {
-                    "timestamp": dt,
+                    "timestamp": _format_utc(ts),
                     "type": kind,
-                    "subreddit": str(sub),
+                    "subreddit": sub,
                     "content": text[:500],
                     **item_scores,  # type: ignore[typeddict-item]
                 }
                 flagged.append(entry)
 
         if flagged:
-            buffer = io.StringIO()
-            writer = csv.DictWriter(
-                buffer,
-                fieldnames=["timestamp", "type", "subreddit", "content", *ATTRIBUTES],
-            )
-            writer.writeheader()
-            writer.writerows(flagged)
-            async with aiofiles.open(self.config.output_reddit, "w", encoding="utf-8") as f:
-                await f.write(buffer.getvalue())
+            if self.config.output_reddit.suffix.lower() == ".json":
+                await asyncio.to_thread(_write_json, self.config.output_reddit, flagged)
+            else:
+                await asyncio.to_thread(self._write_csv, self.config.output_reddit, flagged)
             log.info(
                 "🤖 Reddit:  Saved %d flagged items → %s",
                 len(flagged),
@@ -669,8 +1413,29 @@ async def scan_user(config: ScanConfig) -> ScanResult:
     return out
 
 
+async def _install_eager_task_factory() -> None:
+    """Switch the running loop to eager tasks if it accepts them.
+
+    Some loops reject the ``eager_start`` keyword the factory passes (uvloop 0.23
+    on Python 3.13.0 fails every task creation), so a probe task is created
+    first and the default factory is restored on TypeError.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    probe = asyncio.sleep(0)
+    try:
+        await loop.create_task(probe)
+    except TypeError as exc:
+        probe.close()
+        loop.set_task_factory(None)
+        log.debug("Event loop rejects eager tasks; using the default factory: %s", exc)
+
+
 async def main_async() -> None:
     """Main async entry point for command-line usage."""
+    # Most scan tasks (limiter waits, cache hits, short batches) finish or block
+    # almost immediately; eager tasks run that first step without a loop round-trip.
+    await _install_eager_task_factory()
     parser = argparse.ArgumentParser(
         description="Multi-source account scanner",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -696,6 +1461,31 @@ async def main_async() -> None:
         help="Toxicity threshold (0-1)",
     )
     parser.add_argument("--rate-per-min", type=float, default=60.0, help="API rate limit")
+    parser.add_argument(
+        "--rate-burst",
+        type=float,
+        default=DEFAULT_RATE_BURST,
+        help="Requests allowed back-to-back before rate limiting (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-text-len",
+        type=int,
+        default=3,
+        help="Skip Perspective for texts shorter than this",
+    )
+    parser.add_argument(
+        "--prescreen",
+        type=lambda pattern: re.compile(pattern, re.IGNORECASE),
+        default=None,
+        metavar="REGEX",
+        help="Only send texts matching REGEX to Perspective",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_API_CALLS,
+        help="Max concurrent Perspective requests",
+    )
     parser.add_argument("--sherlock-timeout", type=int, default=120, help="Sherlock timeout (s)")
     parser.add_argument(
         "--output-reddit",
@@ -710,6 +1500,7 @@ async def main_async() -> None:
         help="Sherlock output file",
     )
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("--pretty", action="store_true", help="Indent the Sherlock JSON output")
     args = parser.parse_args()
 
     if args.verbose:
@@ -721,9 +1512,12 @@ async def main_async() -> None:
         results = await scan_user(config)
 
         if results["sherlock"]:
-            json_content = orjson.dumps(results["sherlock"], option=orjson.OPT_INDENT_2)
-            async with aiofiles.open(config.output_sherlock, "wb") as f:
-                await f.write(json_content)
+            await asyncio.to_thread(
+                _write_json,
+                config.output_sherlock,
+                results["sherlock"],
+                orjson.OPT_INDENT_2 if config.pretty else None,
+            )
             log.info(
                 "🔎 Sherlock: Found %d accounts → %s",
                 len(results["sherlock"]),
@@ -738,9 +1532,15 @@ async def main_async() -> None:
 
 def main() -> None:
     """Main entry point for CLI execution."""
-    uvloop.install()
+    loop_factory: Callable[[], asyncio.AbstractEventLoop] | None
+    try:
+        import uvloop
+    except ImportError:  # uvloop is not published for Windows
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
     try:
-        asyncio.run(main_async())
+        asyncio.run(main_async(), loop_factory=loop_factory)
     except KeyboardInterrupt:
         log.info("\nInterrupted by user")
         sys.exit(130)
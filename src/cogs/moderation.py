@@ -4,37 +4,42 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import re
-from collections import deque
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Final
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from account_scanner import (
     RateLimiter,
     ScanConfig,
     ScanResult,
     SherlockScanner,
+    sanitize_username,
     scan_user,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from discord_bot import BotConfig, ModerationBot
 
 log = logging.getLogger(__name__)
 
 MAX_SCAN_LENGTH: Final = 50
+_VALID_MODES: Final = frozenset({"sherlock", "reddit", "both"})
+_REDDIT_MODES: Final = frozenset({"reddit", "both"})
+_SHERLOCK_MODES: Final = frozenset({"sherlock", "both"})
 SCAN_TIMEOUT: Final = 300
 SCANS_DIR: Final = Path("./scans")
 
 GLOBAL_LIMITER = RateLimiter(rate_per_min=60.0)
 
-_scan_cooldowns: dict[int, float] = {}
-_cooldown_queue: deque[tuple[float, int]] = deque()
+# Loop time at which each user may scan again (a GCRA theoretical arrival time).
+_scan_ready_at: dict[int, float] = {}
 COOLDOWN_SECONDS = 30
+COOLDOWN_SWEEP_HOURS = 1
 
 
 def chunk_message(lines: list[str], header: str = "", max_length: int = 1900) -> list[str]:
@@ -84,28 +89,40 @@ class ModerationCog(commands.Cog, name="Moderation"):
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        """Create the scans directory on first ready."""
-        SCANS_DIR.mkdir(exist_ok=True)
-        log.info("Moderation cog ready - Scans directory: %s", SCANS_DIR.absolute())
+        """Create the scans directory on first ready (off the event loop)."""
+        await asyncio.to_thread(SCANS_DIR.mkdir, exist_ok=True)
+        if log.isEnabledFor(logging.INFO):  # absolute() costs a getcwd() call
+            log.info("Moderation cog ready - Scans directory: %s", SCANS_DIR.absolute())
+
+    async def cog_load(self) -> None:
+        """Start the periodic cooldown sweep."""
+        self._sweep_cooldowns.start()
+
+    async def cog_unload(self) -> None:
+        """Stop the periodic cooldown sweep."""
+        self._sweep_cooldowns.cancel()
 
     def check_cooldown(self, user_id: int) -> tuple[bool, float]:
         """Return (is_on_cooldown, seconds_remaining) for *user_id*."""
-        now = asyncio.get_running_loop().time()
-        while _cooldown_queue and now - _cooldown_queue[0][0] >= COOLDOWN_SECONDS:
-            ts, uid = _cooldown_queue.popleft()
-            if uid in _scan_cooldowns and _scan_cooldowns[uid] == ts:
-                del _scan_cooldowns[uid]
-        if user_id in _scan_cooldowns:
-            elapsed = now - _scan_cooldowns[user_id]
-            if elapsed < COOLDOWN_SECONDS:
-                return True, COOLDOWN_SECONDS - elapsed
+        remaining = _scan_ready_at.get(user_id, 0.0) - asyncio.get_running_loop().time()
+        if remaining > 0:
+            return True, remaining
         return False, 0.0
 
     def update_cooldown(self, user_id: int) -> None:
-        """Record a new cooldown timestamp for *user_id*."""
+        """Start a new cooldown for *user_id*."""
+        _scan_ready_at[user_id] = asyncio.get_running_loop().time() + COOLDOWN_SECONDS
+
+    def release_cooldown(self, user_id: int) -> None:
+        """Drop a cooldown reserved for a scan that was then rejected."""
+        _scan_ready_at.pop(user_id, None)
+
+    @tasks.loop(hours=COOLDOWN_SWEEP_HOURS)
+    async def _sweep_cooldowns(self) -> None:
+        """Drop expired cooldowns periodically rather than on every check."""
         now = asyncio.get_running_loop().time()
-        _scan_cooldowns[user_id] = now
-        _cooldown_queue.append((now, user_id))
+        for user_id in [uid for uid, ready_at in _scan_ready_at.items() if ready_at <= now]:
+            del _scan_ready_at[user_id]
 
     async def _send_detailed_results(
         self,
@@ -114,38 +131,26 @@ class ModerationCog(commands.Cog, name="Moderation"):
         results: ScanResult,
     ) -> None:
         """Send detailed scan results as chunked Discord messages."""
+        # Resolve the send target once rather than re-checking the context per chunk.
+        _send: Callable[[str], Awaitable[Any]] = (
+            ctx.followup.send if isinstance(ctx, discord.Interaction) else ctx.send
+        )
 
-        async def _send(text: str) -> None:
-            if isinstance(ctx, discord.Interaction):
-                await ctx.followup.send(text)
-            else:
-                await ctx.send(text)
-
-        if results.get("sherlock"):
-            sherlock = results["sherlock"]
-            assert sherlock is not None
+        if sherlock := results.get("sherlock"):
             lines = [f"{a['platform']}: {a['url']}" for a in sherlock]
             # Remove direct mentions like <@123>
             clean_username = discord.utils.escape_markdown(
                 discord.utils.escape_mentions(username)
             ).replace("<@", "<\\@")
             header = f"**🔎 Sherlock OSINT Results for {clean_username}:**\n```\n"
-            full_text = header + "\n".join(lines) + "\n```"
-            if len(full_text) <= 1900:
-                await _send(full_text)
-            else:
-                chunks = chunk_message(lines, header=header, max_length=1900)
-                for i in range(len(chunks)):
-                    if i > 0 and not chunks[i].startswith("```"):
-                        chunks[i] = "```\n" + chunks[i]
-                    if not chunks[i].endswith("```"):
-                        chunks[i] = chunks[i] + "\n```"
-                for chunk in chunks:
-                    await _send(chunk)
-
-        if results.get("reddit"):
-            reddit = results["reddit"]
-            assert reddit is not None
+            # One path for short and long lists: every chunk is fenced, and
+            # continuation chunks reopen the code block.
+            for i, chunk in enumerate(chunk_message(lines, header=header, max_length=1900)):
+                opener = "```\n" if i > 0 and not chunk.startswith("```") else ""
+                closer = "" if chunk.endswith("```") else "\n```"
+                await _send(opener + chunk + closer)
+
+        if reddit := results.get("reddit"):
             clean_username = discord.utils.escape_markdown(
                 discord.utils.escape_mentions(username)
             ).replace("<@", "<\\@")
@@ -175,7 +180,6 @@ class ModerationCog(commands.Cog, name="Moderation"):
         description="Scan a user across platforms for moderation purposes",
     )
     @commands.has_permissions(moderate_members=True)
-    @commands.cooldown(1, 30, commands.BucketType.user)
     @app_commands.describe(
         username="Target username to scan (max 50 characters)",
         mode="Scan mode: sherlock (OSINT), reddit (toxicity), or both",
@@ -194,13 +198,15 @@ class ModerationCog(commands.Cog, name="Moderation"):
         mode: str = "both",
     ) -> None:
         """Scan a user across platforms for moderation purposes."""
-        user_id = ctx.author.id if isinstance(ctx, commands.Context) else ctx.interaction.user.id
-
-        if isinstance(ctx, commands.Context) and ctx.interaction:
-            on_cooldown, remaining = self.check_cooldown(user_id)
-            if on_cooldown:
-                await ctx.send(f"⏱️ Cooldown: try again in {remaining:.1f}s", ephemeral=True)
-                return
+        # Cooldowns are tracked here rather than with @commands.cooldown so that
+        # requests rejected by the validation below don't start one. The check and
+        # the reservation must not be separated by an await on the accepting path,
+        # or two invocations arriving together could both pass.
+        user_id = ctx.author.id
+        on_cooldown, remaining = self.check_cooldown(user_id)
+        if on_cooldown:
+            await ctx.send(f"⏱️ Cooldown: try again in {remaining:.1f}s", ephemeral=True)
+            return
 
         if len(username) > MAX_SCAN_LENGTH:
             await ctx.send(
@@ -208,22 +214,22 @@ class ModerationCog(commands.Cog, name="Moderation"):
             )
             return
 
-        if mode not in ("sherlock", "reddit", "both"):
+        if mode not in _VALID_MODES:
             await ctx.send("❌ Mode must be: sherlock, reddit, or both", ephemeral=True)
             return
 
-        if mode in ("reddit", "both") and not self.config.has_reddit_config():
+        if mode in _REDDIT_MODES and not self.config.has_reddit_config():
             await ctx.send("❌ Reddit scanning not configured on this bot", ephemeral=True)
             return
 
-        if mode in ("sherlock", "both") and not await SherlockScanner.available():
+        self.update_cooldown(user_id)
+
+        if mode in _SHERLOCK_MODES and not await SherlockScanner.available():
+            self.release_cooldown(user_id)
             await ctx.send("❌ Sherlock not available on this bot", ephemeral=True)
             return
 
-        if isinstance(ctx, commands.Context) and ctx.interaction:
-            self.update_cooldown(user_id)
-
-        safe_username = re.sub(r"[^\w\-]", "_", username)
+        safe_username = sanitize_username(username)
         clean_username = discord.utils.escape_markdown(
             discord.utils.escape_mentions(username)
         ).replace("<@", "<\\@")
@@ -272,7 +278,7 @@ class ModerationCog(commands.Cog, name="Moderation"):
             )
             embed.set_footer(text=f"Requested by {ctx.author.name}")
 
-            if mode in ("sherlock", "both"):
+            if mode in _SHERLOCK_MODES:
                 sherlock_results = results.get("sherlock")
                 if sherlock_results:
                     embed.add_field(
@@ -287,7 +293,7 @@ class ModerationCog(commands.Cog, name="Moderation"):
                         inline=False,
                     )
 
-            if mode in ("reddit", "both"):
+            if mode in _REDDIT_MODES:
                 reddit_res = results.get("reddit")
                 if reddit_res:
                     flagged = len(reddit_res)
@@ -304,8 +310,8 @@ class ModerationCog(commands.Cog, name="Moderation"):
                         inline=False,
                     )
 
-            if results.get("errors"):
-                error_text = "\n".join(f"• {err}" for err in results["errors"])
+            if errors := results.get("errors"):
+                error_text = "\n".join(f"• {err}" for err in errors)
                 embed.add_field(name="⚠️ Issues", value=error_text[:1024], inline=False)
 
             if ctx.interaction:
@@ -9,14 +9,16 @@ import asyncio
 import logging
 import os
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import discord
-import uvloop
 from discord.ext import commands
 
 from account_scanner import close_http_client
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 # Logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -206,11 +208,15 @@ def main() -> None:
         log.error("Configuration error: %s", exc)
         sys.exit(1)
 
+    loop_factory: Callable[[], asyncio.AbstractEventLoop] | None
     try:
-        uvloop.install()
-        log.info("uvloop installed for better async performance")
-    except (ImportError, RuntimeError) as exc:
-        log.warning("Failed to install uvloop, using default event loop: %s", exc)
+        import uvloop
+    except ImportError as exc:  # uvloop is not published for Windows
+        log.warning("uvloop unavailable, using default event loop: %s", exc)
+        loop_factory = None
+    else:
+        log.info("Using uvloop for better async performance")
+        loop_factory = uvloop.new_event_loop
 
     log.info("=" * 60)
     log.info("Discord Account Scanner Bot v1.3.0")
@@ -228,7 +234,7 @@ def main() -> None:
     log.info("Starting Discord bot...")
 
     try:
-        asyncio.run(_run_bot(config))
+        asyncio.run(_run_bot(config), loop_factory=loop_factory)
     except discord.LoginFailure as exc:
         log.error("❌ Discord login failed - invalid token: %s", exc)
         log.error("Check your DISCORD_BOT_TOKEN environment variable")
@@ -1,10 +1,12 @@
 """Tests for the moderation cog."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import discord
 import pytest
 
+from cogs import moderation
 from cogs.moderation import ModerationCog
 
 
@@ -85,3 +87,70 @@ async def test_send_detailed_results_escapes_mentions_reddit():
     ).replace("<@", "<\\@")
     assert escaped_username in sent_text
     assert "**🤖 Reddit Toxicity Analysis for " + escaped_username + ":**" in sent_text
+
+
+@pytest.mark.anyio
+async def test_cooldown_expires_and_is_swept():
+    """A scan starts a per-user cooldown that lapses and is later swept away."""
+    cog = ModerationCog(MagicMock())
+    moderation._scan_ready_at.clear()
+
+    assert cog.check_cooldown(1) == (False, 0.0)
+    cog.update_cooldown(1)
+    on_cooldown, remaining = cog.check_cooldown(1)
+    assert on_cooldown
+    assert 0 < remaining <= moderation.COOLDOWN_SECONDS
+
+    moderation._scan_ready_at[1] -= moderation.COOLDOWN_SECONDS
+    assert cog.check_cooldown(1) == (False, 0.0)
+    cog.update_cooldown(2)
+    await cog._sweep_cooldowns()
+    assert list(moderation._scan_ready_at) == [2]
+    moderation._scan_ready_at.clear()
+
+
+@pytest.mark.anyio
+async def test_concurrent_scans_reserve_cooldown_before_awaiting(monkeypatch):
+    """Two invocations arriving together must not both pass the cooldown check."""
+    moderation._scan_ready_at.clear()
+    cog = ModerationCog(MagicMock())
+
+    async def slow_available():
+        await asyncio.sleep(0)
+        return True
+
+    scan_user = AsyncMock(
+        return_value={"username": "alice", "sherlock": [], "reddit": None, "errors": []}
+    )
+    monkeypatch.setattr(moderation.SherlockScanner, "available", slow_available)
+    monkeypatch.setattr(moderation, "scan_user", scan_user)
+
+    ctx = MagicMock()
+    ctx.author.id = 1
+    ctx.interaction = None
+    ctx.send = AsyncMock()
+
+    await asyncio.gather(
+        cog.scan.callback(cog, ctx, "alice", "sherlock"),
+        cog.scan.callback(cog, ctx, "alice", "sherlock"),
+    )
+
+    scan_user.assert_awaited_once()
+    assert any("Cooldown" in str(c.args[0]) for c in ctx.send.await_args_list if c.args)
+    moderation._scan_ready_at.clear()
+
+
+@pytest.mark.anyio
+async def test_rejected_scan_releases_reserved_cooldown(monkeypatch):
+    """A scan rejected after the reservation does not leave the user on cooldown."""
+    moderation._scan_ready_at.clear()
+    cog = ModerationCog(MagicMock())
+    monkeypatch.setattr(moderation.SherlockScanner, "available", AsyncMock(return_value=False))
+
+    ctx = MagicMock()
+    ctx.author.id = 1
+    ctx.send = AsyncMock()
+
+    await cog.scan.callback(cog, ctx, "alice", "sherlock")
+
+    assert cog.check_cooldown(1) == (False, 0.0)
@@ -1,16 +1,62 @@
 """Tests for account_scanner core logic."""
 
 import asyncio
+import csv
+import logging
+import re
+import signal
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterable
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import httpx
+import orjson
 import pytest
 
-from account_scanner import RateLimiter, RedditScanner, ScanConfig, SherlockScanner
+import account_scanner
+from account_scanner import (
+    ATTRIBUTES,
+    CACHE_TTL,
+    CSV_FIELDS,
+    DEFAULT_RATE_BURST,
+    AdmissionController,
+    PerspectiveAuthError,
+    RateLimiter,
+    RedditFlaggedItem,
+    RedditItem,
+    RedditScanner,
+    ScanConfig,
+    ScanResult,
+    SherlockScanner,
+    _format_utc,
+    _post_with_retry,
+    get_cached_result,
+    get_http_client,
+    sanitize_username,
+    scan_user,
+)
 
 DEFAULT_THRESHOLD = 0.7
 
 
+@pytest.fixture(autouse=True)
+def _clear_module_caches() -> Generator[None]:
+    account_scanner._score_cache.clear()
+    account_scanner._reddit_tokens.clear()
+    account_scanner._scan_cache.clear()
+    yield
+    account_scanner._score_cache.clear()
+    account_scanner._reddit_tokens.clear()
+    account_scanner._scan_cache.clear()
+
+
 def test_config_defaults() -> None:
     cfg = ScanConfig(username="test")
     assert cfg.username == "test"
@@ -24,6 +70,13 @@ def test_config_sanitises_username() -> None:
     assert " " not in cfg.username
 
 
+@pytest.mark.parametrize("name", ["alice_bob-99", "te st/../bad", "a.b@c!", "jürgen ß", "名前 x"])
+def test_config_sanitises_username_like_regex(name: str) -> None:
+    expected = re.sub(r"[^\w\-]", "_", name)
+    assert sanitize_username(name) == expected
+    assert ScanConfig(username=name).username == expected
+
+
 def test_config_sets_default_user_agent() -> None:
     cfg = ScanConfig(username="alice")
     assert cfg.user_agent is not None
@@ -67,16 +120,18 @@ async def test_rate_limiter_no_sleep_on_first_call() -> None:
 
 
 async def test_rate_limiter_sleeps_when_called_too_soon() -> None:
-    limiter = RateLimiter(rate_per_min=60.0)  # 1s delay
+    limiter = RateLimiter(rate_per_min=60.0, burst=1)  # 1s per token
+    limiter.tokens = 0.0
     limiter.last_call = 100.0
-    # now=100.5, elapsed=0.5 → needs 0.5s sleep
+    # now=100.5, 0.5 tokens refilled → needs 0.5s sleep for the rest
     with (
-        patch("time.monotonic", side_effect=[100.5, 100.5]),
+        patch("time.monotonic", side_effect=[100.5, 101.0]),
         patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
     ):
         await limiter.wait()
         mock_sleep.assert_called_once_with(pytest.approx(0.5))
-        assert limiter.last_call == 100.5
+        assert limiter.last_call == 101.0
+        assert limiter.tokens == pytest.approx(0.0)
 
 
 async def test_rate_limiter_no_sleep_after_full_delay() -> None:
@@ -93,14 +148,203 @@ async def test_rate_limiter_no_sleep_after_full_delay() -> None:
 
 
 async def test_rate_limiter_updates_last_call_after_sleep() -> None:
-    limiter = RateLimiter(rate_per_min=60.0)
+    limiter = RateLimiter(rate_per_min=60.0, burst=1)
+    limiter.tokens = 0.0
     limiter.last_call = 100.0
     with (
-        patch("time.monotonic", side_effect=[100.2, 100.8]),
+        patch("time.monotonic", side_effect=[100.2, 101.0]),
         patch("asyncio.sleep", new_callable=AsyncMock),
     ):
         await limiter.wait()
-        assert limiter.last_call == 100.8
+        assert limiter.last_call == 101.0
+
+
+async def test_rate_limiter_takes_multiple_tokens_beyond_capacity() -> None:
+    limiter = RateLimiter(rate_per_min=60.0, burst=2)
+    with (
+        patch("time.monotonic", side_effect=[100.0, 102.0, 103.0]),
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        await limiter.wait(5)
+    # 2 tokens up front, then two capacity-sized refills (2s, then 1s).
+    assert [c.args[0] for c in mock_sleep.await_args_list] == [
+        pytest.approx(2.0),
+        pytest.approx(1.0),
+    ]
+    assert limiter.tokens == pytest.approx(0.0)
+
+
+async def test_rate_limiter_pause_holds_callers_until_resume() -> None:
+    limiter = RateLimiter(rate_per_min=60.0, burst=5)
+    with patch("time.monotonic", return_value=100.0):
+        limiter.pause(3.0)
+    # Full bucket, but nothing may pass before 103.0.
+    with (
+        patch("time.monotonic", side_effect=[101.0, 103.0]),
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        await limiter.wait()
+        mock_sleep.assert_called_once_with(pytest.approx(2.0))
+        assert limiter.tokens == pytest.approx(0.0)
+
+
+def test_rate_limiter_burst_default_matches_scan_config() -> None:
+    limiter = RateLimiter(rate_per_min=30.0)
+    assert limiter.capacity == DEFAULT_RATE_BURST
+    assert limiter.tokens == DEFAULT_RATE_BURST
+    assert ScanConfig(username="alice").rate_burst == DEFAULT_RATE_BURST
+
+
+async def test_rate_limiter_allows_burst_without_sleep() -> None:
+    limiter = RateLimiter(rate_per_min=60.0, burst=3)
+    with (
+        patch("time.monotonic", return_value=100.0),
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        await asyncio.gather(*(limiter.wait() for _ in range(3)))
+        mock_sleep.assert_not_called()
+        assert limiter.tokens == pytest.approx(0.0)
+
+
+async def test_get_cached_result_purges_expired_entries() -> None:
+    now = time.monotonic()
+    result = ScanResult(username="x", sherlock=None, reddit=None, errors=[])
+    account_scanner._scan_cache["stale"] = (now - CACHE_TTL - 1, result)
+    account_scanner._scan_cache["fresh"] = (now, result)
+
+    assert await get_cached_result("missing") is None
+
+    assert list(account_scanner._scan_cache) == ["fresh"]
+
+
+async def test_http_client_honours_environment_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.test:3128")
+    monkeypatch.setenv("NO_PROXY", "commentanalyzer.googleapis.com")
+    client = await get_http_client()
+    try:
+        proxied = client._transport_for_url(httpx.URL("https://oauth.reddit.com/user/a"))
+        direct = client._transport_for_url(httpx.URL("https://commentanalyzer.googleapis.com/"))
+        assert proxied is not client._transport
+        assert direct is client._transport
+    finally:
+        await account_scanner.close_http_client()
+
+
+async def test_reddit_token_request_retries_failed_connect_once() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", client_id="id", client_secret="secret"))
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = [
+        httpx.ConnectError("refused"),
+        httpx.Response(
+            200,
+            request=httpx.Request("POST", "https://www.reddit.com/api/v1/access_token"),
+            json={"access_token": "token"},
+        ),
+    ]
+
+    assert await scanner._get_access_token(client, {}) == "token"
+    assert client.post.await_count == 2
+
+
+async def test_install_eager_task_factory_uses_eager_tasks() -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        await account_scanner._install_eager_task_factory()
+        assert loop.get_task_factory() is asyncio.eager_task_factory
+    finally:
+        loop.set_task_factory(None)
+
+
+async def test_install_eager_task_factory_falls_back_when_loop_rejects_it() -> None:
+    def rejecting_factory(loop: asyncio.AbstractEventLoop, coro: object, **kwargs: object) -> None:
+        raise TypeError("factory() got an unexpected keyword argument 'eager_start'")
+
+    with patch.object(asyncio, "eager_task_factory", rejecting_factory):
+        await account_scanner._install_eager_task_factory()
+
+    assert asyncio.get_running_loop().get_task_factory() is None
+
+
+def test_http_client_is_not_reused_across_event_loops() -> None:
+    async def open_client() -> httpx.AsyncClient:
+        client = await get_http_client()
+        assert await get_http_client() is client
+        return client
+
+    first = asyncio.run(open_client())
+    second = asyncio.run(open_client())
+
+    assert second is not first
+    asyncio.run(first.aclose())
+    asyncio.run(second.aclose())
+
+
+async def test_admission_controller_resizes_while_callers_wait() -> None:
+    admission = AdmissionController(4)
+    await admission.throttled(0.0)
+    assert admission.limit == 2
+
+    gate = asyncio.Event()
+    in_flight = peak = 0
+
+    async def worker() -> None:
+        nonlocal in_flight, peak
+        async with admission:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await gate.wait()
+            in_flight -= 1
+
+    tasks = [asyncio.create_task(worker()) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert in_flight == 2
+
+    await admission.succeeded()
+    await admission.succeeded()
+    await asyncio.sleep(0)
+    assert in_flight == 4
+    await admission.succeeded()
+    assert admission.limit == 4
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert peak == 4
+    assert admission.active == 0
+
+
+async def test_post_with_retry_narrows_admission_on_429() -> None:
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = [httpx.Response(429), httpx.Response(200, content=b"{}")]
+    admission = AdmissionController(8)
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        await _post_with_retry(client, "https://example.test", admission=admission)
+
+    assert admission.limit == 5
+
+
+async def test_admission_controller_halves_once_per_backoff_window() -> None:
+    admission = AdmissionController(64)
+    await asyncio.gather(*(admission.throttled(5.0) for _ in range(10)))
+    assert admission.limit == 32
+
+    with patch("account_scanner.time.monotonic", return_value=time.monotonic() + 6.0):
+        await admission.throttled(5.0)
+    assert admission.limit == 16
+
+
+async def test_post_with_retry_retried_429s_halve_admission_once() -> None:
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = [
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(200, content=b"{}"),
+    ]
+    admission = AdmissionController(8)
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        await _post_with_retry(client, "https://example.test", admission=admission)
+
+    assert admission.limit == 5
 
 
 def test_sherlock_parse_stdout_empty() -> None:
@@ -121,27 +365,60 @@ def test_sherlock_parse_stdout_valid() -> None:
     assert results[0]["response_time"] is None
 
 
+def test_sherlock_parse_stdout_accepts_raw_bytes() -> None:
+    results = SherlockScanner._parse_stdout(b"[+] GitHub: https://github.com/alice\xff\n")
+    assert [(r["platform"], r["url"]) for r in results] == [("GitHub", "https://github.com/alice")]
+
+
 def test_sherlock_parse_stdout_deduplicates() -> None:
     text = "[+] GitHub: https://github.com/alice\n[+] GitHub: https://github.com/alice"
     results = SherlockScanner._parse_stdout(text)
     assert len(results) == 1
 
 
-async def test_sherlock_scan_command_order() -> None:
-    captured_cmd: tuple[str, ...] | None = None
+def test_sherlock_parse_stdout_mixed_output() -> None:
+    text = (
+        "[*] Checking username alice on:\n"
+        "\n"
+        "[+] GitHub: https://github.com/alice\r\n"
+        "[+] Keybase: https://keybase.io/alice  \n"
+        "[-] Twitter: Not Found!\n"
+        "[+] github: https://github.com/alice\n"
+        "[*] Search completed with 2 results\n"
+    )
+    results = SherlockScanner._parse_stdout(text)
+    assert [(r["platform"], r["url"]) for r in results] == [
+        ("GitHub", "https://github.com/alice"),
+        ("Keybase", "https://keybase.io/alice"),
+    ]
+    assert SherlockScanner._parse_stdout(text.encode()) == results
+
+
+class _FakeStreamReader:
+    """Minimal asyncio.StreamReader stand-in yielding *data* line by line."""
+
+    def __init__(self, data: bytes, *, eof: bool = True) -> None:
+        self._lines = data.splitlines(keepends=True)
+        self._eof = eof
+
+    async def read(self) -> bytes:
+        return b"".join(self._lines)
 
-    class FakeStreamReader:
-        def __init__(self, data: bytes) -> None:
-            self._data = data
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for line in self._lines:
+            yield line
+        if not self._eof:
+            await asyncio.Event().wait()
 
-        async def read(self) -> bytes:
-            return self._data
+
+async def test_sherlock_scan_command_order() -> None:
+    captured_cmd: tuple[str, ...] | None = None
 
     class FakeSuccessfulProcess:
         def __init__(self) -> None:
             self.returncode: int = 0
-            self.stdout = FakeStreamReader(b"[+] GitHub: https://github.com/alice\n")
-            self.stderr = FakeStreamReader(b"")
+            self.stdout = _FakeStreamReader(b"[+] GitHub: https://github.com/alice\n")
+            self.stderr = _FakeStreamReader(b"")
 
         async def wait(self) -> int:
             return self.returncode
@@ -153,14 +430,19 @@ async def test_sherlock_scan_command_order() -> None:
         assert kwargs["stderr"] == asyncio.subprocess.PIPE
         return FakeSuccessfulProcess()
 
-    with patch(
-        "account_scanner.asyncio.create_subprocess_exec", side_effect=fake_create_subprocess_exec
+    with (
+        patch("account_scanner._has_sherlock_api", return_value=False),
+        patch("account_scanner._sherlock_path", return_value="/opt/bin/sherlock"),
+        patch(
+            "account_scanner.asyncio.create_subprocess_exec",
+            side_effect=fake_create_subprocess_exec,
+        ),
     ):
         results = await SherlockScanner().scan("alice", timeout_seconds=120, verbose=False)
 
     assert results[0]["url"] == "https://github.com/alice"
     assert captured_cmd == (
-        "sherlock",
+        "/opt/bin/sherlock",
         "--timeout",
         "120",
         "--no-color",
@@ -173,46 +455,48 @@ async def test_sherlock_scan_command_order() -> None:
 async def test_sherlock_scan_timeout_recovery() -> None:
     """Partial Sherlock output is preserved when the subprocess times out."""
 
-    class FakeStreamReader:
-        def __init__(self, data: bytes) -> None:
-            self._data = data
-
-        async def read(self) -> bytes:
-            return self._data
-
     class FakeTimeoutProcess:
         def __init__(self) -> None:
-            self.stdout = FakeStreamReader(b"[+] GitHub: https://github.com/alice\n")
-            self.stderr = FakeStreamReader(b"")
+            # The pipe never reaches EOF, as when a child process keeps it open.
+            self.stdout = _FakeStreamReader(b"[+] GitHub: https://github.com/alice\n", eof=False)
+            self.stderr = _FakeStreamReader(b"")
             self.returncode: int | None = None
+            self.pid = 4321
             self.killed: bool = False
 
         async def wait(self) -> int:
-            # Hang until killed; the second call (after proc.kill()) returns immediately.
+            # Hang until killed; the call after the group SIGTERM returns immediately.
             if not self.killed:
                 await asyncio.sleep(9999)
-            self.returncode = -9
-            return -9
-
-        def kill(self) -> None:
-            self.killed = True
+            self.returncode = -15
+            return -15
 
     proc = FakeTimeoutProcess()
+    signalled: list[tuple[int, int]] = []
+
+    def fake_killpg(pgid: int, sig: int) -> None:
+        signalled.append((pgid, sig))
+        proc.killed = True
 
     # SHERLOCK_BUFFER is patched so timeout = timeout_seconds + SHERLOCK_BUFFER = 0,
     # which causes asyncio.wait_for to raise TimeoutError immediately without ever
     # running the fake proc.wait() coroutine.
     with (
+        patch("account_scanner._has_sherlock_api", return_value=False),
         patch("account_scanner.SHERLOCK_BUFFER", -1),
+        patch("account_scanner.SHERLOCK_PARTIAL_READ_TIMEOUT", 0.05),
+        patch("account_scanner.os.killpg", side_effect=fake_killpg),
         patch(
             "account_scanner.asyncio.create_subprocess_exec",
             new=AsyncMock(return_value=proc),
-        ),
+        ) as create,
     ):
         results = await SherlockScanner().scan("alice", timeout_seconds=1, verbose=False)
 
-    assert proc.killed is True
-    assert proc.returncode == -9
+    # Sherlock leads its own process group, so the whole group gets SIGTERM.
+    assert create.call_args.kwargs["start_new_session"] is True
+    assert signalled == [(4321, signal.SIGTERM)]
+    assert proc.returncode == -15
     assert results == [
         {
             "platform": "GitHub",
@@ -223,7 +507,124 @@ async def test_sherlock_scan_timeout_recovery() -> None:
     ]
 
 
-async def test_reddit_fetch_items_uses_reddit_oauth_api(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_sherlock_scan_cancel_stops_reader_tasks() -> None:
+    class FakeHangingProcess:
+        def __init__(self) -> None:
+            self.stdout = _FakeStreamReader(b"", eof=False)
+            self.stderr = _FakeStreamReader(b"")
+            self.returncode: int | None = None
+            self.pid = 4321
+
+        async def wait(self) -> int:
+            await asyncio.Event().wait()
+            return 0
+
+    before = asyncio.all_tasks()
+    with (
+        patch("account_scanner._has_sherlock_api", return_value=False),
+        patch("account_scanner.os.killpg"),
+        patch(
+            "account_scanner.asyncio.create_subprocess_exec",
+            new=AsyncMock(return_value=FakeHangingProcess()),
+        ),
+    ):
+        scan = asyncio.create_task(
+            SherlockScanner().scan("alice", timeout_seconds=60, verbose=False)
+        )
+        await asyncio.sleep(0.01)
+        scan.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await scan
+        await asyncio.sleep(0)
+
+    assert asyncio.all_tasks() == before
+
+
+def _fake_sherlock_modules(fake_sherlock: Callable[..., object]) -> dict[str, object]:
+    return {
+        "sherlock_project": ModuleType("sherlock_project"),
+        "sherlock_project.notify": SimpleNamespace(QueryNotify=object),
+        "sherlock_project.result": SimpleNamespace(QueryStatus=SimpleNamespace(CLAIMED="CLAIMED")),
+        "sherlock_project.sherlock": SimpleNamespace(sherlock=fake_sherlock),
+    }
+
+
+def _query_result(site: str, url: str, status: str, query_time: float) -> SimpleNamespace:
+    return SimpleNamespace(site_name=site, site_url_user=url, status=status, query_time=query_time)
+
+
+async def test_sherlock_scan_uses_python_api_when_importable(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    def fake_sherlock(
+        username: str, site_data: dict[str, object], notify: Any, timeout: int
+    ) -> dict[str, dict[str, object]]:
+        assert username == "alice"
+        assert timeout == 60
+        notify.update(_query_result("GitHub", "https://github.com/alice", "CLAIMED", 0.25))
+        notify.update(_query_result("Twitter", "https://x.com/alice", "AVAILABLE", 0.1))
+        return {}
+
+    fake_modules = _fake_sherlock_modules(fake_sherlock)
+    create_subprocess = AsyncMock()
+    with (
+        patch.dict(sys.modules, fake_modules),
+        patch("account_scanner._has_sherlock_api", return_value=True),
+        patch("account_scanner._load_sherlock_site_data", return_value={}),
+        patch("account_scanner.asyncio.create_subprocess_exec", create_subprocess),
+        caplog.at_level(logging.INFO, logger="account_scanner"),
+    ):
+        results = await SherlockScanner().scan(
+            "alice", timeout_seconds=60, verbose=True, output_dir=tmp_path
+        )
+
+    create_subprocess.assert_not_called()
+    assert "[+] GitHub: https://github.com/alice" in caplog.text
+    assert "x.com" not in caplog.text
+    assert results == [
+        {
+            "platform": "GitHub",
+            "url": "https://github.com/alice",
+            "status": "Claimed",
+            "response_time": 0.25,
+        }
+    ]
+    assert (tmp_path / "alice.txt").read_text(encoding="utf-8") == (
+        "https://github.com/alice\nTotal Websites Username Detected On : 1\n"
+    )
+
+
+async def test_sherlock_python_api_timeout_stops_thread_and_keeps_partial_results() -> None:
+    stopped = threading.Event()
+
+    def fake_sherlock(
+        username: str, site_data: dict[str, object], notify: Any, timeout: int
+    ) -> dict[str, dict[str, object]]:
+        notify.update(_query_result("GitHub", "https://github.com/alice", "CLAIMED", 0.25))
+        try:
+            while True:
+                time.sleep(0.01)
+                notify.update(_query_result("Slow", "https://slow.test/alice", "AVAILABLE", 5.0))
+        finally:
+            stopped.set()
+
+    with (
+        patch.dict(sys.modules, _fake_sherlock_modules(fake_sherlock)),
+        patch("account_scanner._has_sherlock_api", return_value=True),
+        patch("account_scanner._load_sherlock_site_data", return_value={}),
+        patch("account_scanner.SHERLOCK_BUFFER", -0.95),
+    ):
+        results = await SherlockScanner().scan("alice", timeout_seconds=1, verbose=False)
+
+    assert [r["url"] for r in results] == ["https://github.com/alice"]
+    assert await asyncio.to_thread(stopped.wait, 1)
+
+
+async def _collect_listings(scanner: RedditScanner) -> list[RedditItem]:
+    return [item async for page in scanner._iter_listings() for item in page]
+
+
+async def test_reddit_iter_listings_uses_reddit_oauth_api(monkeypatch: pytest.MonkeyPatch) -> None:
     client_id = "client-id"
     client_secret = "client-secret"
     scanner = RedditScanner(
@@ -240,6 +641,7 @@ async def test_reddit_fetch_items_uses_reddit_oauth_api(monkeypatch: pytest.Monk
         requests.append(("POST", url))
         assert kwargs["data"] == {"grant_type": "client_credentials"}
         assert kwargs["auth"] == (client_id, client_secret)
+        assert "Content-Type" not in self.headers
         return httpx.Response(
             200,
             request=httpx.Request("POST", url),
@@ -250,7 +652,8 @@ async def test_reddit_fetch_items_uses_reddit_oauth_api(monkeypatch: pytest.Monk
         requests.append(("GET", url))
         assert kwargs["params"]["sort"] == "new"
         assert kwargs["params"]["raw_json"] == 1
-        assert self.headers["Authorization"] == "Bearer token"
+        assert kwargs["headers"]["Authorization"] == "Bearer token"
+        assert kwargs["headers"]["User-Agent"] == "account-scanner-test"
         if url == "https://oauth.reddit.com/user/alice/comments":
             assert kwargs["params"]["limit"] == scanner.config.comments
             return httpx.Response(
@@ -294,9 +697,9 @@ async def test_reddit_fetch_items_uses_reddit_oauth_api(monkeypatch: pytest.Monk
     monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
     monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
 
-    items = await scanner._fetch_items()
+    items = await _collect_listings(scanner)
 
-    assert items == [
+    assert sorted(items) == [
         ("comment", "python", "hello", 123.0),
         ("post", "asyncio", "post\nbody", 456.0),
     ]
@@ -307,7 +710,49 @@ async def test_reddit_fetch_items_uses_reddit_oauth_api(monkeypatch: pytest.Monk
     ]
 
 
-async def test_reddit_fetch_items_returns_none_on_http_error(
+async def test_reddit_iter_listings_requests_both_listings_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    scanner = RedditScanner(
+        ScanConfig(username="alice", client_id="id", client_secret="secret", comments=1, posts=1)
+    )
+    both_started = asyncio.Event()
+    in_flight: set[str] = set()
+
+    async def fake_post(self: httpx.AsyncClient, url: str, **kwargs: object) -> httpx.Response:
+        return httpx.Response(200, request=httpx.Request("POST", url), json={"access_token": "t"})
+
+    async def fake_get(self: httpx.AsyncClient, url: str, **kwargs: object) -> httpx.Response:
+        in_flight.add(url)
+        if len(in_flight) == 2:
+            both_started.set()
+        # Each listing blocks until the other has been requested too.
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        return httpx.Response(200, request=httpx.Request("GET", url), json={"data": {}})
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
+    monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
+
+    assert await _collect_listings(scanner) == []
+    assert both_started.is_set()
+
+
+def test_parse_children_skips_deleted_and_removed_bodies() -> None:
+    children = [
+        {"data": {"subreddit": "a", "body": "[deleted]", "created_utc": 1}},
+        {"data": {"subreddit": "a", "body": "[removed]", "created_utc": 2}},
+        {"data": {"subreddit": "a", "body": "kept", "created_utc": 3}},
+    ]
+    posts = [
+        {"data": {"subreddit": "b", "title": "Title", "selftext": "[removed]", "created_utc": 4}},
+        {"data": {"subreddit": "b", "title": "", "selftext": "[deleted]", "created_utc": 5}},
+    ]
+
+    assert RedditScanner._parse_children("comments", children) == [("comment", "a", "kept", 3.0)]
+    assert RedditScanner._parse_children("submitted", posts) == [("post", "b", "Title", 4.0)]
+
+
+async def test_reddit_iter_listings_yields_nothing_on_http_error(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     client_id = "client-id"
@@ -329,10 +774,481 @@ async def test_reddit_fetch_items_returns_none_on_http_error(
 
     monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
 
-    assert await scanner._fetch_items() is None
+    assert await _collect_listings(scanner) == []
 
 
-async def test_reddit_fetch_items_returns_none_when_credentials_missing() -> None:
+async def test_reddit_iter_listings_yields_nothing_when_credentials_missing() -> None:
     scanner = RedditScanner(ScanConfig(username="alice"))
 
-    assert await scanner._fetch_items() is None
+    assert await _collect_listings(scanner) == []
+
+
+def _batch_response_body(boundary: str, parts: list[tuple[int, int, bytes]]) -> bytes:
+    chunks = [
+        (
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-item-{index}>\r\n\r\n"
+            f"HTTP/1.1 {status} OK\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        ).encode()
+        + body
+        + b"\r\n"
+        for index, status, body in parts
+    ]
+    return b"".join(chunks) + f"--{boundary}--\r\n".encode()
+
+
+def _scores_json(value: float) -> bytes:
+    return (
+        b'{"attributeScores": {"TOXICITY": {"summaryScore": {"value": '
+        + str(value).encode()
+        + b"}}}}"
+    )
+
+
+def test_build_batch_envelope_has_one_part_per_text() -> None:
+    envelope = RedditScanner._build_batch_envelope(["first", "second"], "k&y")
+    assert envelope.count(b"--batch_perspective\r\n") == 2
+    assert envelope.endswith(b"--batch_perspective--\r\n")
+    assert b"Content-ID: <item-1>" in envelope
+    assert b"POST /v1alpha1/comments:analyze?key=k%26y HTTP/1.1" in envelope
+    assert b'"text":"second"' in envelope
+
+
+def test_parse_batch_response_maps_content_ids_out_of_order() -> None:
+    body = _batch_response_body(
+        "batch_abc",
+        [(1, 200, _scores_json(0.9)), (0, 200, _scores_json(0.1)), (2, 429, b"{}")],
+    )
+    scores = RedditScanner._parse_batch_response(
+        "multipart/mixed; boundary=batch_abc", body, count=3
+    )
+    assert scores == [{"TOXICITY": 0.1}, {"TOXICITY": 0.9}, None]
+
+
+def test_parse_batch_response_requires_boundary() -> None:
+    with pytest.raises(ValueError, match="boundary"):
+        RedditScanner._parse_batch_response("application/json", b"", count=1)
+
+
+async def test_check_toxicity_batch_skips_blank_texts() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", rate_per_min=6000.0))
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.return_value = httpx.Response(
+        200,
+        headers={"Content-Type": "multipart/mixed; boundary=batch_xyz"},
+        content=_batch_response_body(
+            "batch_xyz", [(0, 200, _scores_json(0.8)), (1, 200, _scores_json(0.2))]
+        ),
+    )
+
+    scores = await scanner._check_toxicity_batch(client, ["bad", "  ", "fine"], "key")
+
+    assert scores == [{"TOXICITY": 0.8}, {}, {"TOXICITY": 0.2}]
+    client.post.assert_awaited_once()
+    assert client.post.call_args.args[0] == "https://commentanalyzer.googleapis.com/batch"
+
+
+async def test_check_toxicity_batch_rescores_failed_parts_individually() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", rate_per_min=6000.0))
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = [
+        httpx.Response(
+            200,
+            headers={"Content-Type": "multipart/mixed; boundary=batch_xyz"},
+            content=_batch_response_body(
+                "batch_xyz",
+                [(0, 200, _scores_json(0.8)), (1, 503, b"{}"), (2, 200, _scores_json(0.2))],
+            ),
+        ),
+        httpx.Response(200, content=_scores_json(0.7)),
+    ]
+
+    scores = await scanner._check_toxicity_batch(client, ["bad", "flaky", "fine"], "key")
+
+    assert scores == [{"TOXICITY": 0.8}, {"TOXICITY": 0.7}, {"TOXICITY": 0.2}]
+    assert client.post.await_count == 2
+    assert orjson.loads(client.post.call_args.kwargs["content"])["comment"]["text"] == "flaky"
+
+
+async def test_post_with_retry_retries_on_429_with_retry_after() -> None:
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = [
+        httpx.Response(429, headers={"Retry-After": "3"}),
+        httpx.Response(503),
+        httpx.Response(200, content=b"{}"),
+    ]
+    limiter = RateLimiter(rate_per_min=60.0)
+    with (
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        patch("random.uniform", return_value=0.25),
+    ):
+        resp = await _post_with_retry(client, "https://example.test", limiter=limiter)
+
+    assert resp.status_code == 200
+    assert client.post.await_count == 3
+    assert [c.args[0] for c in mock_sleep.await_args_list] == [3.0, 2.25]
+    # The Retry-After also pushed the shared limiter's next refill ~3s out.
+    assert limiter.last_call - time.monotonic() > 2.5
+    assert "limiter" not in client.post.call_args.kwargs
+
+
+async def test_post_with_retry_does_not_retry_client_errors() -> None:
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.return_value = httpx.Response(400)
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        resp = await _post_with_retry(client, "https://example.test")
+
+    assert resp.status_code == 400
+    client.post.assert_awaited_once()
+    mock_sleep.assert_not_called()
+
+
+async def test_post_with_retry_reraises_after_exhausting_transport_errors() -> None:
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.side_effect = httpx.ConnectError("boom")
+    with (
+        patch("asyncio.sleep", new_callable=AsyncMock),
+        pytest.raises(httpx.ConnectError),
+    ):
+        await _post_with_retry(client, "https://example.test")
+
+    assert client.post.await_count == 4
+
+
+@pytest.mark.parametrize("text", ["hello", 'quote " and \\ slash', "unicode ✓\nnewline"])
+def test_build_payload_matches_full_serialisation(text: str) -> None:
+    expected = orjson.dumps(
+        {
+            "comment": {"text": text},
+            "languages": ["en"],
+            "requestedAttributes": {a: {} for a in ATTRIBUTES},
+        }
+    )
+    assert RedditScanner._build_payload(text) == expected
+
+
+type _Listings = Iterable[list[RedditItem]] | Callable[[], AsyncIterator[list[RedditItem]]]
+
+
+async def _always_toxic(text: str) -> float:
+    return 0.9
+
+
+@contextmanager
+def _patch_listings(scanner: RedditScanner, listings: _Listings) -> Generator[None]:
+    """Make *scanner* read *listings* (pages, or an async generator function) instead of Reddit."""
+
+    async def fake_listings() -> AsyncIterator[list[RedditItem]]:
+        if callable(listings):
+            async for page in listings():
+                yield page
+        else:
+            for page in listings:
+                yield page
+
+    with patch.object(scanner, "_iter_listings", fake_listings):
+        yield
+
+
+@contextmanager
+def _patched_scan(
+    scanner: RedditScanner,
+    listings: _Listings,
+    score: Callable[[str], Awaitable[float]] = _always_toxic,
+) -> Generator[list[list[str]]]:
+    """Patch listings and Perspective scoring on *scanner*; yield the batches it scored."""
+    seen_batches: list[list[str]] = []
+
+    async def fake_batch(
+        client: httpx.AsyncClient, texts: list[str], key: str
+    ) -> list[dict[str, float]]:
+        seen_batches.append(texts)
+        return [{"TOXICITY": await score(t)} for t in texts]
+
+    with (
+        _patch_listings(scanner, listings),
+        patch.object(scanner, "_check_toxicity_batch", side_effect=fake_batch),
+    ):
+        yield seen_batches
+
+
+async def test_reddit_scan_scores_listings_as_they_arrive(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(username="alice", api_key="key", output_reddit=tmp_path / "out.csv")
+    )
+
+    async def listings() -> AsyncIterator[list[RedditItem]]:
+        yield [("post", "asyncio", "toxic post", 456.0)]
+        # The first listing must already be dispatched before the second arrives.
+        await asyncio.sleep(0)
+        assert seen_batches == [["toxic post"]]
+        yield [("comment", "python", "toxic comment", 123.0), ("comment", "python", "nice", 1.0)]
+
+    async def score(text: str) -> float:
+        return 0.9 if "toxic" in text else 0.1
+
+    with _patched_scan(scanner, listings, score) as seen_batches:
+        flagged = await scanner.scan()
+
+    assert flagged is not None
+    assert [item["content"] for item in flagged] == ["toxic comment", "toxic post"]
+    assert (tmp_path / "out.csv").read_text(encoding="utf-8").count("toxic") == 2
+
+
+async def test_reddit_scan_writes_json_for_json_output(tmp_path: Path) -> None:
+    out = tmp_path / "flagged.json"
+    scanner = RedditScanner(ScanConfig(username="alice", api_key="key", output_reddit=out))
+
+    with _patched_scan(scanner, [[("comment", "python", 'toxic, "quoted"', 0.0)]]):
+        flagged = await scanner.scan()
+
+    assert orjson.loads(out.read_bytes()) == flagged
+
+
+def test_write_csv_writes_rows_in_field_order(tmp_path: Path) -> None:
+    out = tmp_path / "flagged.csv"
+    rows: list[RedditFlaggedItem] = [
+        {
+            "timestamp": f"2024-01-01 00:00:{i:02d}",
+            "type": "comment",
+            "subreddit": "python",
+            "content": f'line, with "quotes" {i}',
+            "TOXICITY": 0.9,
+            "INSULT": 0.5,
+        }
+        for i in range(3)
+    ]
+    RedditScanner._write_csv(out, rows)
+
+    with out.open(newline="", encoding="utf-8") as f:
+        parsed = list(csv.reader(f))
+    assert parsed[0] == list(CSV_FIELDS)
+    assert len(parsed) == 4
+    assert parsed[1] == [
+        "2024-01-01 00:00:00",
+        "comment",
+        "python",
+        'line, with "quotes" 0',
+        "0.9",
+        "0.5",
+        "",
+        "",
+    ]
+
+
+@pytest.mark.parametrize("ts", [0.0, 123.9, 1_700_000_000.5, 4_102_444_799.0])
+def test_format_utc_matches_strftime(ts: float) -> None:
+    expected = datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
+    assert _format_utc(ts) == expected
+
+
+async def test_reddit_scan_dedupes_repeated_texts_and_reuses_cache(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(username="alice", api_key="key", output_reddit=tmp_path / "out.csv")
+    )
+    pages: list[list[RedditItem]] = [
+        [("comment", "a", "copypasta", 1.0), ("comment", "b", "copypasta", 2.0)],
+        [("post", "c", "copypasta", 3.0), ("post", "c", "unique", 4.0)],
+    ]
+
+    with _patched_scan(scanner, pages) as seen_batches:
+        flagged = await scanner.scan()
+        assert flagged is not None
+        assert len(flagged) == 4
+        assert seen_batches == [["copypasta"], ["unique"]]
+
+        seen_batches.clear()
+        await scanner.scan()
+        assert seen_batches == []
+
+
+async def test_check_toxicity_posts_prebuilt_url() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", rate_per_min=6000.0))
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.return_value = httpx.Response(200, content=_scores_json(0.4))
+
+    assert await scanner._check_toxicity(client, "hello", "k&y") == {"TOXICITY": 0.4}
+
+    url = client.post.call_args.args[0]
+    assert isinstance(url, httpx.URL)
+    assert url.params["key"] == "k&y"
+    assert "params" not in client.post.call_args.kwargs
+
+
+async def test_reddit_fetch_listing_follows_after_cursor() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", comments=150))
+    calls: list[dict[str, object]] = []
+
+    async def fake_get(url: str, **kwargs: object) -> httpx.Response:
+        params = kwargs["params"]
+        assert isinstance(params, dict)
+        calls.append(dict(params))
+        child = {"data": {"subreddit": "python", "body": "hi", "created_utc": 1.0}}
+        count = params["limit"]
+        assert isinstance(count, int)
+        after = "t1_next" if "after" not in params else None
+        return httpx.Response(
+            200,
+            request=httpx.Request("GET", url),
+            json={"data": {"children": [child] * count, "after": after}},
+        )
+
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.get.side_effect = fake_get
+    pages = [page async for page in scanner._fetch_comments(client, {})]
+
+    assert [len(page) for page in pages] == [100, 50]
+    assert [c["limit"] for c in calls] == [100, 50]
+    assert calls[1]["after"] == "t1_next"
+
+
+async def test_reddit_scan_skips_texts_below_min_length(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(
+            username="alice",
+            api_key="key",
+            min_text_len=4,
+            output_reddit=tmp_path / "out.csv",
+        )
+    )
+    pages: list[list[RedditItem]] = [
+        [("comment", "a", " ok ", 1.0), ("comment", "a", "idiot", 2.0)]
+    ]
+
+    with _patched_scan(scanner, pages) as seen_batches:
+        flagged = await scanner.scan()
+
+    assert seen_batches == [["idiot"]]
+    assert flagged is not None
+    assert [item["content"] for item in flagged] == ["idiot"]
+
+
+async def test_reddit_scan_prescreen_skips_unmatched_texts(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(
+            username="alice",
+            api_key="key",
+            prescreen=re.compile(r"idiot|moron", re.IGNORECASE),
+            output_reddit=tmp_path / "out.csv",
+        )
+    )
+    pages: list[list[RedditItem]] = [
+        [("comment", "a", "lovely day", 1.0), ("comment", "a", "You IDIOT", 2.0)]
+    ]
+
+    with _patched_scan(scanner, pages) as seen_batches:
+        flagged = await scanner.scan()
+
+    assert seen_batches == [["You IDIOT"]]
+    assert flagged is not None
+    assert [item["content"] for item in flagged] == ["You IDIOT"]
+
+
+async def test_reddit_scan_bounds_in_flight_batches(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(
+            username="alice",
+            api_key="key",
+            max_concurrency=2,
+            output_reddit=tmp_path / "out.csv",
+        )
+    )
+    in_flight = peak = 0
+
+    async def slow_score(text: str) -> float:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return 0.1
+
+    pages = [[("comment", "a", f"text {i}", float(i))] for i in range(5)]
+    with _patched_scan(scanner, pages, slow_score):
+        await scanner.scan()
+
+    assert peak == 2
+
+
+async def test_reddit_scan_stops_after_perspective_rejects_key(tmp_path: Path) -> None:
+    scanner = RedditScanner(
+        ScanConfig(
+            username="alice",
+            api_key="bad",
+            rate_per_min=6000.0,
+            max_concurrency=1,
+            output_reddit=tmp_path / "out.csv",
+        )
+    )
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.return_value = httpx.Response(403)
+
+    pages = [[("comment", "a", f"text {i}", float(i))] for i in range(5)]
+
+    with (
+        patch("account_scanner.get_http_client", AsyncMock(return_value=client)),
+        _patch_listings(scanner, pages),
+        pytest.raises(PerspectiveAuthError, match="HTTP 403"),
+    ):
+        await scanner.scan()
+
+    client.post.assert_awaited_once()
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_extract_scores_keeps_only_requested_attributes() -> None:
+    data = {
+        "attributeScores": {
+            "INSULT": {"summaryScore": {"value": 0.3}},
+            "THREAT": {"summaryScore": {"value": 0.8}},
+            "TOXICITY": {"summaryScore": {"value": 0.6}},
+        }
+    }
+    assert RedditScanner._extract_scores(data) == {"TOXICITY": 0.6, "INSULT": 0.3}
+    assert RedditScanner._extract_scores({"attributeScores": None}) == {}
+
+
+async def test_reddit_access_token_is_reused_until_expiry() -> None:
+    scanner = RedditScanner(ScanConfig(username="alice", client_id="id", client_secret="secret"))
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post.return_value = httpx.Response(
+        200,
+        request=httpx.Request("POST", "https://www.reddit.com/api/v1/access_token"),
+        json={"access_token": "token", "expires_in": 3600},
+    )
+
+    with patch("account_scanner.time.monotonic", return_value=1000.0):
+        assert await scanner._get_access_token(client, {}) == "token"
+        assert await scanner._get_access_token(client, {}) == "token"
+    client.post.assert_awaited_once()
+
+    with patch("account_scanner.time.monotonic", return_value=1000.0 + 3600):
+        await scanner._get_access_token(client, {})
+    assert client.post.await_count == 2
+
+
+async def test_scan_user_runs_sherlock_and_reddit_concurrently() -> None:
+    config = ScanConfig(username="alice", api_key="k", client_id="id", client_secret="s")
+    sherlock_started = asyncio.Event()
+    reddit_started = asyncio.Event()
+
+    async def fake_sherlock(self: SherlockScanner, *args: object) -> list[object]:
+        sherlock_started.set()
+        await asyncio.wait_for(reddit_started.wait(), timeout=1)
+        return []
+
+    async def fake_reddit(self: RedditScanner) -> None:
+        reddit_started.set()
+        await asyncio.wait_for(sherlock_started.wait(), timeout=1)
+
+    with (
+        patch.object(SherlockScanner, "available", AsyncMock(return_value=True)),
+        patch.object(SherlockScanner, "scan", fake_sherlock),
+        patch.object(RedditScanner, "scan", fake_reddit),
+    ):
+        result = await scan_user(config)
+
+    assert result["errors"] == []
+    assert result["sherlock"] == []